@@ -1,6 +1,11 @@
 # Очистка консолі
 print('\033c', end='')
 
+import heapq
+import io
+from array import array
+from itertools import islice
+
 # Головні налаштування
 # Кольори
 RESET  = '\033[0m'
@@ -14,6 +19,11 @@ CYAN   = '\033[36m'
 # Шаблони
 TITLE = '\033[1;104m'
 
+# Порожнє посилання для ArrayLinkedList (аналог None)
+NIL = -1
+# Кількість елементів, що записуються у файл за один виклик write()
+WRITE_CHUNK_SIZE = 1024
+
 # Утилітні методи
 def print_title(title):
     """
@@ -43,11 +53,50 @@ def print_sub2(subtitle):
     print(f"  {BOLD+RED}{subtitle}{RESET}")
 
 
+def _write_elements(fileobj, elements, size, limit=None, color=True):
+    """
+    Записує елементи списку у файловий об'єкт порціями, не будуючи весь рядок.
+
+    Args:
+        fileobj: Об'єкт з методом write (файл, sys.stdout, io.StringIO).
+        elements: Ітератор даних вузлів.
+        size (int): Загальна кількість елементів.
+        limit (int, optional): Максимальна кількість елементів для виводу.
+            Решта позначається як "... N more".
+        color (bool): Оформлювати елементи кольорами терміналу.
+    """
+    if color:
+        separator = f' {GRAY}->{RESET} '
+        template = BOLD + GREEN + '{}' + RESET
+    else:
+        separator = ' -> '
+        template = '{}'
+    shown = size if limit is None else min(limit, size)
+
+    fileobj.write('    ')
+    elements = islice(elements, shown)
+    first = True
+    while True:
+        chunk = [template.format(el) for el in islice(elements, WRITE_CHUNK_SIZE)]
+        if not chunk:
+            break
+        if not first:
+            fileobj.write(separator)
+        fileobj.write(separator.join(chunk))
+        first = False
+    if shown < size:
+        more = f'... {size - shown} more'
+        fileobj.write((separator if shown else '') + (DIM + more + RESET if color else more))
+
+
 class Node:
     """
     Клас для представлення вузла однозв'язного списку.
     Кожен вузол містить дані та посилання на наступний вузол.
+    __slots__ прибирає словник атрибутів і суттєво зменшує розмір вузла.
     """
+    __slots__ = ('data', 'next')
+
     def __init__(self, data=None):
         """
         Ініціалізація вузла.
@@ -59,53 +108,232 @@ class Node:
         self.next = None
 
 
+# Константи для вибору алгоритму сортування в LinkedList.sort
+SORT_ALGORITHMS = ('auto', 'insertion', 'merge')
+SMALL_LIST_SIZE = 32  # До цього розміру сортування вставками швидше за злиття
+
+
+def _merge_nodes(p1, tail1, p2, tail2, keys=None, reverse=False):
+    """
+    Зливає два відсортовані ланцюжки вузлів в один, переставляючи посилання.
+    Злиття стабільне: за рівних ключів першим іде вузол з першого ланцюжка.
+
+    Args:
+        p1 (Node): Голова першого ланцюжка (або None).
+        tail1 (Node): Останній вузол першого ланцюжка.
+        p2 (Node): Голова другого ланцюжка (або None).
+        tail2 (Node): Останній вузол другого ланцюжка.
+        keys (dict, optional): Заздалегідь обчислені ключі {вузол: ключ}.
+        reverse (bool): Зливати за спаданням.
+
+    Returns:
+        tuple: Голова та останній вузол об'єднаного ланцюжка.
+    """
+    # Створюємо "фіктивний" вузол, щоб спростити код
+    dummy_node = Node()
+    # 'tail' буде вказувати на останній вузол у новому ланцюжку
+    tail = dummy_node
+
+    # Поки обидва ланцюжки не закінчились
+    if keys is None and not reverse:
+        # Найчастіший випадок - порівнюємо самі дані без додаткових перевірок
+        while p1 and p2:
+            if p2.data < p1.data:
+                tail.next = p2
+                p2 = p2.next
+            else:
+                tail.next = p1
+                p1 = p1.next
+            tail = tail.next
+    while p1 and p2:
+        k1 = p1.data if keys is None else keys[p1]
+        k2 = p2.data if keys is None else keys[p2]
+        # Беремо вузол з другого ланцюжка лише за строгої нерівності - це дає стабільність
+        if (k1 < k2) if reverse else (k2 < k1):
+            tail.next = p2
+            p2 = p2.next
+        else:
+            tail.next = p1
+            p1 = p1.next
+        # Переміщуємо 'tail' на щойно доданий вузол
+        tail = tail.next
+
+    # Якщо в одному з ланцюжків залишились вузли, додаємо їх в кінець
+    if p1:
+        tail.next = p1
+        tail = tail1
+    elif p2:
+        tail.next = p2
+        tail = tail2
+
+    head = dummy_node.next
+    return head, (tail if head is not None else None)
+
+
+def _split_run(head, length):
+    """
+    Відрізає від ланцюжка перші 'length' вузлів.
+
+    Args:
+        head (Node): Голова ланцюжка.
+        length (int): Довжина відрізка.
+
+    Returns:
+        tuple: Останній вузол відрізка та голова решти ланцюжка.
+    """
+    for _ in range(length - 1):
+        if head.next is None:
+            break
+        head = head.next
+    rest = head.next
+    head.next = None
+    return head, rest
+
+
 class LinkedList:
     """
     Клас для реалізації однозв'язного списку.
-    Містить посилання на головний (перший) вузол списку.
+    Містить посилання на головний (перший) та останній вузли списку,
+    а також кількість елементів у ньому.
     """
-    def __init__(self):
+    def __init__(self, guard=False):
         """
         Ініціалізація порожнього списку.
+
+        Args:
+            guard (bool): Перевіряти список на цикли перед кожним обходом.
         """
         self.head = None
+        self.tail = None  # Останній вузол, для додавання в кінець за O(1)
+        self.size = 0     # Кількість вузлів у списку
+        self.guard = guard
+
+    def __getstate__(self):
+        """
+        Серіалізує список як масив даних: стандартний pickle обходить ланцюжок
+        вузлів рекурсивно і падає на довгих списках.
+        """
+        return {'items': list(self), 'guard': self.guard}
+
+    def __setstate__(self, state):
+        """
+        Відновлює список з масиву даних після десеріалізації.
+        """
+        self.__init__(state['guard'])
+        self.extend(state['items'])
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """
+        Створює новий список з елементів довільного ітерованого об'єкта за O(n).
+
+        Args:
+            iterable: Джерело даних для вузлів списку.
+
+        Returns:
+            LinkedList: Новий список з тими самими елементами в тому ж порядку.
+        """
+        new_list = cls()
+        new_list.extend(iterable)
+        return new_list
 
     def __str__(self) -> str:
         """
         Створює рядок зі вмістом списку.
         """
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    def __iter__(self):
+        """
+        Повертає ітератор по даних вузлів від голови до кінця.
+        """
+        if self.guard:
+            self.validate()
         current_node = self.head
-        elements = []
         while current_node:
-            elements.append(str(current_node.data))
+            yield current_node.data
             current_node = current_node.next
-        return '    ' + f' {GRAY}->{RESET} '.join(BOLD + GREEN + el + RESET for el in elements)
+
+    def __len__(self) -> int:
+        """
+        Повертає кількість вузлів у списку за O(1).
+        """
+        return self.size
+
+    def __reversed__(self):
+        """
+        Повертає ітератор по даних вузлів від кінця до голови.
+        Однозв'язний список не має зворотних посилань, тому дані спершу
+        збираються в масив (O(n) пам'яті).
+        """
+        return reversed(list(self))
+
+    def write_to(self, fileobj, limit=None, color=True):
+        """
+        Записує вміст списку у файловий об'єкт порціями, без побудови
+        проміжного рядка з усіма елементами.
+
+        Args:
+            fileobj: Об'єкт з методом write (файл, sys.stdout, io.StringIO).
+            limit (int, optional): Максимальна кількість елементів для виводу.
+            color (bool): Оформлювати елементи кольорами терміналу.
+        """
+        _write_elements(fileobj, iter(self), self.size, limit, color)
 
     def append(self, data):
         """
-        Додає новий вузол з даними в кінець списку.
+        Додає новий вузол з даними в кінець списку за O(1).
 
         Args:
             data: Дані для нового вузла.
         """
         new_node = Node(data)
         if self.head is None:
-            # Якщо список порожній, новий вузол стає головним
+            # Якщо список порожній, новий вузол стає і головним, і останнім
             self.head = new_node
-            return
-        # Інакше, йдемо до кінця списку
-        last_node = self.head
-        while last_node.next:
+        else:
+            # Інакше, причіплюємо вузол одразу після останнього
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
+
+    def extend(self, iterable):
+        """
+        Додає в кінець списку всі елементи ітерованого об'єкта за O(k),
+        де k - кількість нових елементів.
+
+        Args:
+            iterable: Джерело даних для нових вузлів.
+        """
+        # Фіктивний вузол дозволяє не перевіряти порожність списку в циклі
+        dummy_node = Node()
+        last_node = dummy_node
+        count = 0
+        for data in iterable:
+            last_node.next = Node(data)
             last_node = last_node.next
-        # Додаємо новий вузол в кінець
-        last_node.next = new_node
+            count += 1
+        if count == 0:
+            return
+        if self.head is None:
+            self.head = dummy_node.next
+        else:
+            self.tail.next = dummy_node.next
+        self.tail = last_node
+        self.size += count
 
     def reverse(self):
         """
         Реверсує однозв'язний список, змінюючи посилання між вузлами.
         """
+        if self.guard:
+            self.validate()
         prev_node = None
         current_node = self.head
+        # Колишній головний вузол стане останнім
+        self.tail = current_node
         while current_node is not None:
             # Зберігаємо посилання на наступний вузол, щоб не втратити його
             next_node = current_node.next
@@ -122,11 +350,14 @@ class LinkedList:
         """
         Сортує однозв'язний список, використовуючи алгоритм сортування вставками.
         """
+        if self.guard:
+            self.validate()
         # Перевірка, чи список порожній або має лише один елемент
         if self.head is None or self.head.next is None:
             return
 
         sorted_head = None  # Голова нового, відсортованого списку
+        sorted_tail = None  # Останній вузол відсортованого списку
         current = self.head
 
         while current:
@@ -137,6 +368,8 @@ class LinkedList:
                 # Якщо відсортований список порожній або новий елемент менший за голову
                 current.next = sorted_head
                 sorted_head = current
+                if sorted_tail is None:
+                    sorted_tail = current
             else:
                 # Шукаємо місце для вставки у відсортованій частині
                 search_node = sorted_head
@@ -145,16 +378,501 @@ class LinkedList:
                 # Вставляємо вузол
                 current.next = search_node.next
                 search_node.next = current
+                if current.next is None:
+                    sorted_tail = current
 
             current = next_node_to_process # Переходимо до наступного вузла з оригінального списку
 
-        # Оновлюємо голову нашого списку
+        # Оновлюємо голову та останній вузол нашого списку
         self.head = sorted_head
+        self.tail = sorted_tail
+
+    def find_cycle(self):
+        """
+        Шукає цикл у ланцюжку вузлів алгоритмом Брента за O(n) часу та O(1) пам'яті.
+
+        Returns:
+            Node: Перший вузол циклу або None, якщо циклу немає.
+        """
+        if self.head is None:
+            return None
+        # Етап 1: шукаємо довжину циклу, подвоюючи "вікно" черепахи
+        power = cycle_length = 1
+        tortoise = self.head
+        hare = self.head.next
+        while tortoise is not hare:
+            if hare is None:
+                return None
+            if power == cycle_length:
+                tortoise = hare
+                power *= 2
+                cycle_length = 0
+            hare = hare.next
+            cycle_length += 1
+
+        # Етап 2: заяць випереджає черепаху на довжину циклу - зустрінуться на його початку
+        tortoise = hare = self.head
+        for _ in range(cycle_length):
+            hare = hare.next
+        while tortoise is not hare:
+            tortoise = tortoise.next
+            hare = hare.next
+        return tortoise
+
+    def validate(self):
+        """
+        Перевіряє цілісність списку: відсутність циклів, а також відповідність
+        лічильника size та вузла tail реальному ланцюжку.
+
+        Raises:
+            ValueError: Якщо список пошкоджено.
+        """
+        cycle_start = self.find_cycle()
+        if cycle_start is not None:
+            raise ValueError(f"Список містить цикл, що починається з вузла {cycle_start.data!r}")
+        count = 0
+        last_node = None
+        current_node = self.head
+        while current_node:
+            count += 1
+            last_node = current_node
+            current_node = current_node.next
+        if count != self.size:
+            raise ValueError(f"Лічильник size ({self.size}) не збігається з кількістю вузлів ({count})")
+        if last_node is not self.tail:
+            raise ValueError("Посилання tail не вказує на останній вузол списку")
+
+    def split(self, k):
+        """
+        Розрізає список за один прохід на k частин, розміри яких відрізняються
+        не більше ніж на 1. Вузли переносяться в нові списки, поточний стає порожнім.
+        Частини можна, наприклад, відсортувати в пулі процесів і з'єднати через concat.
+
+        Args:
+            k (int): Кількість частин.
+
+        Returns:
+            list[LinkedList]: Список з k частин (деякі порожні, якщо k > size).
+
+        Raises:
+            ValueError: Якщо k менше 1.
+        """
+        if k < 1:
+            raise ValueError("Кількість частин має бути не менше 1")
+        if self.guard:
+            self.validate()
+        base, extra = divmod(self.size, k)
+        parts = []
+        current = self.head
+        for index in range(k):
+            part = self.__class__(self.guard)
+            part_size = base + (1 if index < extra else 0)
+            if part_size:
+                part.head = current
+                for _ in range(part_size - 1):
+                    current = current.next
+                part.tail = current
+                part.size = part_size
+                current = current.next
+                part.tail.next = None
+            parts.append(part)
+        self.head = self.tail = None
+        self.size = 0
+        return parts
+
+    @classmethod
+    def concat(cls, *lists):
+        """
+        З'єднує списки один за одним за O(k), де k - кількість списків,
+        використовуючи їхні посилання tail. Вузли переносяться в новий список,
+        а вихідні списки стають порожніми.
+
+        Args:
+            *lists (LinkedList): Списки для з'єднання.
+
+        Returns:
+            LinkedList: Новий список з усіма вузлами; guard увімкнено, якщо він
+            був увімкнений хоча б в одному з джерел.
+        """
+        joined = cls(guard=any(source.guard for source in lists))
+        for source in lists:
+            if source.head is None:
+                continue
+            if joined.head is None:
+                joined.head = source.head
+            else:
+                joined.tail.next = source.head
+            joined.tail = source.tail
+            joined.size += source.size
+            source.head = source.tail = None
+            source.size = 0
+        return joined
+
+    def merge_sort(self, key=None, reverse=False):
+        """
+        Сортує список висхідним (ітеративним) сортуванням злиттям за O(n log n).
+
+        Вузли не створюються і не копіюються - змінюються лише посилання, тож
+        глибина рекурсії не обмежує розмір списку. Сортування стабільне.
+
+        Args:
+            key (callable, optional): Функція, що повертає ключ порівняння елемента.
+            reverse (bool): Сортувати за спаданням.
+        """
+        if self.guard:
+            self.validate()
+        if self.size < 2:
+            return
+        # Ключі обчислюються лише один раз на вузол, як у list.sort
+        self._merge_sort(None if key is None else self._compute_keys(key), reverse)
+
+    def _merge_sort(self, keys, reverse):
+        """Висхідне злиття за вже обчисленими ключами (keys=None - порівнюються самі дані)."""
+        dummy_node = Node()
+        dummy_node.next = self.head
+        width = 1
+        while width < self.size:
+            # За один прохід зливаємо сусідні пари відрізків довжини width
+            prev_tail = dummy_node
+            current = dummy_node.next
+            while current:
+                left = current
+                left_tail, right = _split_run(left, width)
+                if right is None:
+                    # Непарний відрізок в кінці лишається на місці
+                    prev_tail.next = left
+                    prev_tail = left_tail
+                    break
+                right_tail, current = _split_run(right, width)
+                merged_head, merged_tail = _merge_nodes(left, left_tail, right, right_tail, keys, reverse)
+                prev_tail.next = merged_head
+                prev_tail = merged_tail
+            width *= 2
+
+        self.head = dummy_node.next
+        self.tail = prev_tail
+
+    def sort(self, key=None, reverse=False, algorithm='auto'):
+        """
+        Стабільно сортує список на місці, аналогічно до list.sort.
+
+        Args:
+            key (callable, optional): Функція, що повертає ключ порівняння елемента.
+            reverse (bool): Сортувати за спаданням.
+            algorithm (str): 'insertion', 'merge' або 'auto' - вставками для малих
+                чи майже відсортованих списків (з обмеженням кількості кроків
+                O(n log n), після якого сортування завершує злиття), злиттям
+                в інших випадках. Функція key викликається рівно раз на елемент.
+
+        Raises:
+            ValueError: Якщо вказано невідомий алгоритм.
+        """
+        if algorithm not in SORT_ALGORITHMS:
+            raise ValueError(f"Невідомий алгоритм сортування: {algorithm!r}")
+        if self.guard:
+            self.validate()
+        if self.size < 2:
+            return
+
+        keys = None if key is None else self._compute_keys(key)
+        if algorithm == 'insertion':
+            self._stable_insertion_sort(keys, reverse)
+        elif algorithm == 'merge' or self.size > SMALL_LIST_SIZE and not self._has_few_descents(keys, reverse):
+            self._merge_sort(keys, reverse)
+        elif not self._stable_insertion_sort(keys, reverse, budget=self.size * self.size.bit_length()):
+            # Вставки виявилися дорожчими за O(n log n) - досортовуємо злиттям
+            self._merge_sort(keys, reverse)
+
+    def _compute_keys(self, key):
+        """Повертає словник {вузол: key(дані вузла)} для всіх вузлів списку."""
+        keys = {}
+        current = self.head
+        while current:
+            keys[current] = key(current.data)
+            current = current.next
+        return keys
+
+    def _has_few_descents(self, keys, reverse):
+        """
+        Швидкий попередній фільтр для режиму 'auto': кількість "спадів" порядку
+        не перевищує log2(n). Цього не досить (циклічно зсунутий відсортований
+        список має один спад, але квадратичну вартість вставок), тому остаточно
+        вибір робить бюджет порівнянь у _stable_insertion_sort.
+        """
+        limit = self.size.bit_length()
+        descents = 0
+        current = self.head
+        while current.next:
+            k1 = current.data if keys is None else keys[current]
+            k2 = current.next.data if keys is None else keys[current.next]
+            if (k1 < k2) if reverse else (k2 < k1):
+                descents += 1
+                if descents > limit:
+                    return False
+            current = current.next
+        return True
+
+    def _stable_insertion_sort(self, keys, reverse, budget=None):
+        """
+        Стабільне сортування вставками. Вузол, що не менший за останній у
+        відсортованій частині, додається в кінець за O(1), тому майже
+        відсортований список обробляється майже лінійно.
+
+        Args:
+            budget (int, optional): Найбільша кількість кроків пошуку місця вставки.
+                Якщо її вичерпано, сортування зупиняється, а список лишається
+                коректним: відсортована частина, за нею - ще не оброблені вузли
+                в початковому порядку (тож подальше стабільне злиття теж стабільне).
+
+        Returns:
+            bool: True, якщо список повністю відсортовано.
+        """
+        def before(a, b):
+            # Чи має вузол 'a' стояти строго перед вузлом 'b'
+            ka = a.data if keys is None else keys[a]
+            kb = b.data if keys is None else keys[b]
+            return kb < ka if reverse else ka < kb
+
+        sorted_head = self.head
+        sorted_tail = self.head
+        current = self.head.next
+        sorted_tail.next = None
+
+        while current:
+            next_node_to_process = current.next
+            if not before(current, sorted_tail):
+                # Найчастіший випадок для майже відсортованих даних
+                sorted_tail.next = current
+                sorted_tail = current
+                current.next = None
+            elif before(current, sorted_head):
+                current.next = sorted_head
+                sorted_head = current
+            else:
+                # Шукаємо місце після всіх рівних елементів, щоб зберегти стабільність
+                search_node = sorted_head
+                while not before(current, search_node.next):
+                    search_node = search_node.next
+                    if budget is not None:
+                        budget -= 1
+                if budget is not None and budget < 0:
+                    # Повертаємо ще не вставлений вузол і решту на їхні місця після відсортованої частини
+                    sorted_tail.next = current
+                    self.head = sorted_head
+                    return False
+                current.next = search_node.next
+                search_node.next = current
+            current = next_node_to_process
+
+        self.head = sorted_head
+        self.tail = sorted_tail
+        return True
+
+
+class ArrayLinkedList:
+    """
+    Однозв'язний список, що зберігає вузли не окремими об'єктами, а в паралельних
+    масивах: дані вузла i - у data[i], індекс наступного вузла - у next[i].
+    Звільнені комірки утворюють список вільних місць і використовуються повторно.
+
+    Для числових даних варто вказати typecode модуля array ('q', 'd', ...) -
+    тоді і дані, і посилання займають по 8 байтів на елемент.
+    """
+    def __init__(self, typecode=None):
+        """
+        Ініціалізація порожнього списку.
+
+        Args:
+            typecode (str, optional): Тип елементів масиву даних (див. модуль array).
+                Якщо не вказано, дані зберігаються у звичайному списку Python.
+        """
+        self.data = array(typecode) if typecode else []
+        self.next = array('q')
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+        self.free = NIL  # Голова списку вільних комірок
+
+    @classmethod
+    def from_iterable(cls, iterable, typecode=None):
+        """
+        Створює новий список з елементів довільного ітерованого об'єкта за O(n).
+
+        Args:
+            iterable: Джерело даних для вузлів списку.
+            typecode (str, optional): Тип елементів масиву даних.
+
+        Returns:
+            ArrayLinkedList: Новий список з тими самими елементами в тому ж порядку.
+        """
+        new_list = cls(typecode)
+        new_list.extend(iterable)
+        return new_list
+
+    def __str__(self) -> str:
+        """
+        Створює рядок зі вмістом списку.
+        """
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    def __iter__(self):
+        """
+        Повертає ітератор по даних вузлів від голови до кінця.
+        """
+        data, next_ = self.data, self.next
+        current = self.head
+        while current != NIL:
+            yield data[current]
+            current = next_[current]
+
+    def __len__(self) -> int:
+        """
+        Повертає кількість вузлів у списку за O(1).
+        """
+        return self.size
+
+    def __reversed__(self):
+        """
+        Повертає ітератор по даних вузлів від кінця до голови.
+        Однозв'язний список не має зворотних посилань, тому дані спершу
+        збираються в масив (O(n) пам'яті).
+        """
+        return reversed(list(self))
+
+    def write_to(self, fileobj, limit=None, color=True):
+        """
+        Записує вміст списку у файловий об'єкт порціями, без побудови
+        проміжного рядка з усіма елементами.
+
+        Args:
+            fileobj: Об'єкт з методом write (файл, sys.stdout, io.StringIO).
+            limit (int, optional): Максимальна кількість елементів для виводу.
+            color (bool): Оформлювати елементи кольорами терміналу.
+        """
+        _write_elements(fileobj, iter(self), self.size, limit, color)
+
+    def _allocate(self, value):
+        """
+        Повертає індекс комірки з даними value: вільної або нової в кінці масивів.
+        """
+        index = self.free
+        if index != NIL:
+            self.free = self.next[index]
+            self.data[index] = value
+            self.next[index] = NIL
+        else:
+            index = len(self.next)
+            self.data.append(value)
+            self.next.append(NIL)
+        return index
+
+    def append(self, data):
+        """
+        Додає новий вузол з даними в кінець списку за O(1).
+
+        Args:
+            data: Дані для нового вузла.
+        """
+        index = self._allocate(data)
+        if self.head == NIL:
+            self.head = index
+        else:
+            self.next[self.tail] = index
+        self.tail = index
+        self.size += 1
+
+    def extend(self, iterable):
+        """
+        Додає в кінець списку всі елементи ітерованого об'єкта.
+
+        Args:
+            iterable: Джерело даних для нових вузлів.
+        """
+        for data in iterable:
+            self.append(data)
+
+    def popleft(self):
+        """
+        Видаляє перший вузол списку і повертає його дані.
+        Комірка вузла потрапляє до списку вільних.
+
+        Raises:
+            IndexError: Якщо список порожній.
+        """
+        index = self.head
+        if index == NIL:
+            raise IndexError("popleft з порожнього списку")
+        value = self.data[index]
+        self.head = self.next[index]
+        if self.head == NIL:
+            self.tail = NIL
+        # Звільнена комірка стає головою списку вільних
+        self.next[index] = self.free
+        self.free = index
+        self.size -= 1
+        return value
+
+    def reverse(self):
+        """
+        Реверсує список, змінюючи індекси наступних вузлів.
+        """
+        next_ = self.next
+        prev_node = NIL
+        current_node = self.head
+        self.tail = current_node
+        while current_node != NIL:
+            next_node = next_[current_node]
+            next_[current_node] = prev_node
+            prev_node = current_node
+            current_node = next_node
+        self.head = prev_node
+
+    def insertion_sort(self):
+        """
+        Сортує список вставками, так само як LinkedList.insertion_sort,
+        але переставляє індекси в масиві next замість посилань між об'єктами.
+        """
+        data, next_ = self.data, self.next
+        if self.head == NIL or next_[self.head] == NIL:
+            return
+
+        sorted_head = NIL
+        sorted_tail = NIL
+        current = self.head
+
+        while current != NIL:
+            next_node_to_process = next_[current]
+            value = data[current]
+
+            if sorted_head == NIL or data[sorted_head] >= value:
+                next_[current] = sorted_head
+                sorted_head = current
+                if sorted_tail == NIL:
+                    sorted_tail = current
+            else:
+                search_node = sorted_head
+                while next_[search_node] != NIL and data[next_[search_node]] < value:
+                    search_node = next_[search_node]
+                next_[current] = next_[search_node]
+                next_[search_node] = current
+                if next_[current] == NIL:
+                    sorted_tail = current
+
+            current = next_node_to_process
+
+        self.head = sorted_head
+        self.tail = sorted_tail
 
 
 def merge_sorted_lists(list1: LinkedList, list2: LinkedList) -> LinkedList:
     """
     Об'єднує два відсортовані однозв'язні списки в один новий відсортований список.
+    Вузли переносяться в новий список (як у concat), а вихідні списки стають порожніми.
+
+    Списки з увімкненим guard перевіряються (validate) до злиття, а результат
+    отримує guard, якщо він був хоча б в одному з них.
 
     Args:
         list1 (LinkedList): Перший відсортований список.
@@ -162,36 +880,149 @@ def merge_sorted_lists(list1: LinkedList, list2: LinkedList) -> LinkedList:
 
     Returns:
         LinkedList: Новий об'єднаний та відсортований список.
+
+    Raises:
+        ValueError: Якщо список з guard містить цикл або пошкоджений.
     """
-    # Створюємо "фіктивний" вузол, щоб спростити код
-    dummy_node = Node()
-    # 'tail' буде вказувати на останній вузол у новому списку
-    tail = dummy_node
+    _validate_guarded((list1, list2))
+    # Зливаємо ланцюжки вузлів обох списків, переставляючи посилання
+    head, tail = _merge_nodes(list1.head, list1.tail, list2.head, list2.tail)
 
-    p1 = list1.head
-    p2 = list2.head
+    # Створюємо новий об'єкт списку
+    merged_list = LinkedList(guard=list1.guard or list2.guard)
+    # Голова та останній вузол нового списку - результат злиття
+    merged_list.head = head
+    merged_list.tail = tail
+    merged_list.size = list1.size + list2.size
+    # Вузли тепер належать новому списку - старі head/tail/size стали б недійсними
+    for source in (list1, list2):
+        source.head = source.tail = None
+        source.size = 0
+    return merged_list
 
-    # Поки обидва списки не закінчились
-    while p1 and p2:
-        if p1.data <= p2.data:
-            tail.next = p1
-            p1 = p1.next
+
+def _validate_guarded(sources):
+    """Перевіряє (validate) кожне джерело-LinkedList з увімкненим guard, поки його вузлів ще не зачеплено."""
+    for source in sources:
+        if isinstance(source, LinkedList) and source.guard:
+            source.validate()
+
+
+def _node_values(node):
+    """Значення ланцюжка вузлів, починаючи з node."""
+    while node:
+        yield node.data
+        node = node.next
+
+
+def iter_merge_k_sorted(sources):
+    """
+    Ліниво зливає k відсортованих джерел, утримуючи в купі лише їхні поточні
+    голови. Загальна складність O(n log k), додаткова пам'ять O(k).
+    Джерела-LinkedList з guard перевіряються одразу під час виклику.
+
+    Args:
+        sources: Відсортовані LinkedList або довільні відсортовані ітеровані об'єкти.
+
+    Returns:
+        Генератор елементів усіх джерел у відсортованому порядку. За рівних значень
+        першим іде елемент з джерела, що стоїть раніше у sources.
+
+    Raises:
+        ValueError: Якщо список з guard містить цикл або пошкоджений.
+    """
+    sources = list(sources)
+    _validate_guarded(sources)
+    return _iter_merge(
+        [_node_values(source.head) if isinstance(source, LinkedList) else source for source in sources])
+
+
+def _iter_merge(sources):
+    heap = []
+    for index, source in enumerate(sources):
+        iterator = iter(source)
+        for value in iterator:
+            heap.append((value, index, iterator))
+            break
+    heapq.heapify(heap)
+
+    while heap:
+        value, index, iterator = heap[0]
+        yield value
+        for next_value in iterator:
+            # Заміна вершини дешевша за окремі pop і push
+            heapq.heapreplace(heap, (next_value, index, iterator))
+            break
         else:
-            tail.next = p2
-            p2 = p2.next
-        # Переміщуємо 'tail' на щойно доданий вузол
-        tail = tail.next
+            heapq.heappop(heap)
 
-    # Якщо в одному зі списків залишились елементи, додаємо їх в кінець
-    if p1:
-        tail.next = p1
-    elif p2:
-        tail.next = p2
 
-    # Створюємо новий об'єкт списку
-    merged_list = LinkedList()
-    # Голова нового списку - це наступний вузол після фіктивного
+def _detach_values(linked_list):
+    """
+    Забирає ланцюжок вузлів у списку (список одразу стає порожнім) і повертає
+    генератор його значень - так лінивому злиттю не заважають подальші зміни джерела.
+    """
+    head = linked_list.head
+    linked_list.head = linked_list.tail = None
+    linked_list.size = 0
+    return _node_values(head)
+
+
+def merge_k_sorted_lists(lists, lazy=False):
+    """
+    Об'єднує k відсортованих списків за O(n log k) замість попарного злиття за O(nk).
+
+    Якщо всі джерела є LinkedList, вузли переставляються без створення нових,
+    як у merge_sorted_lists. Інакше результат будується з потоку значень.
+    В усіх режимах джерела-LinkedList споживаються: їхні вузли переходять до
+    результату (або до генератора при lazy=True), а самі списки стають порожніми.
+    Списки з guard перевіряються до злиття, а результат-LinkedList отримує guard,
+    якщо він був хоча б в одному з них.
+
+    Args:
+        lists: Відсортовані LinkedList або довільні відсортовані ітеровані об'єкти.
+        lazy (bool): Повернути генератор значень замість готового списку.
+
+    Returns:
+        LinkedList або генератор: Об'єднаний відсортований результат.
+
+    Raises:
+        ValueError: Якщо список з guard містить цикл або пошкоджений.
+    """
+    lists = list(lists)
+    _validate_guarded(lists)
+    guard = any(isinstance(source, LinkedList) and source.guard for source in lists)
+    if lazy or not all(isinstance(source, LinkedList) for source in lists):
+        merged = _iter_merge(
+            [_detach_values(source) if isinstance(source, LinkedList) else source for source in lists])
+        if lazy:
+            return merged
+        merged_list = LinkedList(guard=guard)
+        merged_list.extend(merged)
+        return merged_list
+
+    # Купа з поточних головних вузлів; індекс списку робить злиття стабільним
+    heap = [(source.head.data, index, source.head) for index, source in enumerate(lists) if source.head]
+    heapq.heapify(heap)
+
+    dummy_node = Node()
+    tail = dummy_node
+    while heap:
+        _, index, node = heap[0]
+        tail.next = node
+        tail = node
+        if node.next:
+            heapq.heapreplace(heap, (node.next.data, index, node.next))
+        else:
+            heapq.heappop(heap)
+
+    merged_list = LinkedList(guard=guard)
     merged_list.head = dummy_node.next
+    merged_list.tail = tail if merged_list.head else None
+    merged_list.size = sum(source.size for source in lists)
+    for source in lists:
+        source.head = source.tail = None
+        source.size = 0
     return merged_list
 
 
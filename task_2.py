@@ -1,10 +1,147 @@
 # Очистка консолі
 print('\033c', end='')
 
+import argparse
 import math
+import os
 import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import numpy as np
 import matplotlib.pyplot as plt
-import math
+from matplotlib.collections import LineCollection
+
+# --- Спільні параметри геометрії дерева (для обох методів візуалізації) ---
+SPLIT_ANGLE         = 45   # Кут розходження гілок (45° для симетричного дерева)
+THICKNESS_REDUCTION = 0.8  # Коефіцієнт зменшення товщини
+# Коефіцієнт зменшення довжини згідно з теоремою Піфагора
+LENGTH_REDUCTION_FACTOR = math.cos(math.radians(SPLIT_ANGLE))
+
+# --- Параметри кешування для інтерактивного методу ---
+GEOMETRY_CACHE_SIZE    = 64    # Скільки обчислених геометрій дерева зберігати
+SURFACE_CACHE_SIZE     = 24    # Скільки готових зображень дерева (поверхонь) зберігати
+DRAG_FRAME_BUDGET      = 0.010 # Час (с) на малювання дерева за кадр під час перетягування повзунка
+LINES_PER_BUDGET_CHECK = 256   # Як часто (в гілках) перевіряти, чи не вичерпано час кадру
+MAX_RECURSION_LEVEL    = 24    # Завдяки відсіканню невидимих гілок можна заглиблюватись далі 15
+ZOOM_STEP              = 1.25  # Множник масштабу за один крок коліщатка миші
+
+
+def compute_tree_geometry(recursion_level, start_pos=(0.0, 0.0), angle=90.0, length=100.0,
+                          thickness=5.0, tilt_angle=0.0, min_length=0.0, viewport=None):
+    """
+    Обчислює геометрію всього дерева Піфагора рівень за рівнем засобами NumPy.
+
+    Замість рекурсивного виклику на кожну гілку всі 2^k гілок рівня k
+    обчислюються однією векторною операцією. Гілки рівня k+1 розташовані
+    парами: нащадки гілки i мають індекси 2i (ліва) та 2i+1 (права),
+    якщо жодне піддерево не було відсічене.
+
+    Режим деталізації (LOD): піддерева, що цілком лежать поза viewport, або гілки,
+    коротші за min_length (у пікселях, якщо координати екранні), відкидаються
+    разом з усіма нащадками ще до обчислення.
+
+    Args:
+        recursion_level (int): Кількість рівнів гілок (стовбур - перший рівень).
+        start_pos (tuple): Координати (x, y) початку стовбура.
+        angle (float): Кут стовбура в градусах.
+        length (float): Довжина стовбура.
+        thickness (float): Товщина стовбура.
+        tilt_angle (float): Нахил дерева в градусах (0 - симетричне дерево).
+        min_length (float): Гілки, коротші за це значення, відкидаються разом з нащадками.
+        viewport (tuple, optional): Видима область (x_min, y_min, x_max, y_max) -
+            піддерева, що її не перетинають, відкидаються.
+
+    Returns:
+        dict: Суцільні масиви, готові для будь-якого рендерера:
+            'segments'  - масив (N, 2, 2) з координатами [(x0, y0), (x1, y1)] гілок;
+            'thickness' - масив (N,) товщин гілок;
+            'depth'     - масив (N,) номерів рівнів (0 - стовбур);
+            'level_offsets' - індекси початку кожного рівня в масивах (довжина рівнів + 1);
+            'skipped'   - кількість відкинутих гілок (разом з усіма їхніми нащадками).
+    """
+    # Кути розколу відносно поточної гілки та відповідні коефіцієнти довжини.
+    # За SPLIT_ANGLE = 45° маємо cos(45° + tilt) == sin(45° - tilt), як у теоремі Піфагора
+    turns = np.array([-(SPLIT_ANGLE - tilt_angle), SPLIT_ANGLE + tilt_angle])
+    factors = np.cos(np.radians(np.abs(turns)))
+    # Гілка довжини l разом з усіма нащадками лежить у колі радіуса l / (1 - f_max)
+    # навколо свого початку (сума геометричної прогресії довжин)
+    max_factor = factors.max()
+    reach = 1.0 / (1.0 - max_factor) if max_factor < 1 else None
+    if reach is None:
+        viewport = None
+
+    x = np.array([start_pos[0]], dtype=float)
+    y = np.array([start_pos[1]], dtype=float)
+    angles = np.array([angle], dtype=float)
+    lengths = np.array([length], dtype=float)
+
+    levels = []
+    skipped = 0
+    for depth in range(recursion_level):
+        keep = None
+        if min_length > 0:
+            keep = lengths >= min_length
+        if viewport is not None:
+            x_min, y_min, x_max, y_max = viewport
+            radius = lengths * reach
+            visible = ((x + radius >= x_min) & (x - radius <= x_max) &
+                       (y + radius >= y_min) & (y - radius <= y_max))
+            keep = visible if keep is None else keep & visible
+        if keep is not None and not keep.all():
+            # Кожна відкинута гілка забирає з собою піддерево з 2^(залишок рівнів) - 1 гілок
+            skipped += int(keep.size - np.count_nonzero(keep)) * (2 ** (recursion_level - depth) - 1)
+            x, y, angles, lengths = x[keep], y[keep], angles[keep], lengths[keep]
+        if x.size == 0:
+            break
+
+        # Кінці всіх гілок поточного рівня
+        angles_rad = np.radians(angles)
+        end_x = x + lengths * np.cos(angles_rad)
+        end_y = y + lengths * np.sin(angles_rad)
+        levels.append((x, y, end_x, end_y))
+
+        # Параметри нащадків: кожна гілка породжує пару (ліва, права)
+        x = np.repeat(end_x, 2)
+        y = np.repeat(end_y, 2)
+        angles = (angles[:, None] + turns).ravel()
+        lengths = (lengths[:, None] * factors).ravel()
+
+    level_sizes = [level[0].size for level in levels]
+    level_offsets = np.concatenate(([0], np.cumsum(level_sizes))).astype(np.int64)
+    total = int(level_offsets[-1])
+
+    segments = np.empty((total, 2, 2))
+    depths = np.empty(total, dtype=np.int32)
+    for depth, (x0, y0, x1, y1) in enumerate(levels):
+        part = slice(level_offsets[depth], level_offsets[depth + 1])
+        segments[part, 0, 0] = x0
+        segments[part, 0, 1] = y0
+        segments[part, 1, 0] = x1
+        segments[part, 1, 1] = y1
+        depths[part] = depth
+
+    return {
+        'segments'     : segments,
+        'thickness'    : thickness * THICKNESS_REDUCTION ** depths,
+        'depth'        : depths,
+        'level_offsets': level_offsets,
+        'skipped'      : skipped,
+    }
+
+
+@lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def cached_tree_geometry(recursion_level, start_pos, angle, length, thickness, tilt_angle,
+                         min_length, viewport=None):
+    """
+    Кешована версія compute_tree_geometry з обмеженим LRU-кешем.
+    Усі аргументи мають бути хешованими (start_pos і viewport - кортежі).
+    Повернуті масиви спільні для всіх викликів і не повинні змінюватися.
+    """
+    return compute_tree_geometry(recursion_level, start_pos, angle, length,
+                                 thickness, tilt_angle, min_length, viewport)
+
 
 # Інтерактивний метод (бонусний).
 # Використовує PyGame для візуалізації.
@@ -55,11 +192,23 @@ class PythagorasTree:
         self.base_angle = -90  # Напрямок дереа вгору
         self.base_thickness = 7
 
+        # Масштаб і зсув вигляду: екранна точка = точка дерева * масштаб + зсув
+        self.view_scale = 1.0
+        self.view_offset = (0.0, 0.0)
+        self.skipped_segments = 0  # Скільки гілок відкинуто відсіканням (LOD) в останньому кадрі
+
         # Змінні для стану інтерфейсу
         self.is_drawing = False
         self.is_dragging_slider = False
+        self.is_panning = False
         self.needs_redraw = True  # Прапорець для перемальовування
 
+        # Кеш готових зображень дерева {(рівень, нахил, вигляд): Surface}, найстаріші видаляються першими
+        self.surface_cache = OrderedDict()
+        self.tree_surface = None     # Зображення дерева, що зараз на екрані
+        self.tree_key = None         # (рівень, нахил, вигляд) для self.tree_surface
+        self.tree_complete = False   # Чи намальоване дерево повністю (не обрізане бюджетом кадру)
+
         # Геометрія елементів керування
         self._setup_ui_rects()
 
@@ -112,7 +261,7 @@ class PythagorasTree:
                     mouse_pos = pygame.mouse.get_pos()
                     # Перевірка кліку по кнопках лічильника
                     if self.level_up_button_rect.collidepoint(mouse_pos):
-                        self.recursion_level = min(15, self.recursion_level + 1)
+                        self.recursion_level = min(MAX_RECURSION_LEVEL, self.recursion_level + 1)
                         self.needs_redraw = True
                     elif self.level_down_button_rect.collidepoint(mouse_pos):
                         self.recursion_level = max(1, self.recursion_level - 1)
@@ -121,19 +270,46 @@ class PythagorasTree:
                     elif self.slider_track_rect.collidepoint(mouse_pos):
                         self.is_dragging_slider = True
                         self._update_slider(mouse_pos)
+                elif event.button == 3:  # Права кнопка миші - переміщення вигляду
+                    self.is_panning = True
 
             # --- Обробка відпускання кнопки миші ---
             elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
+                if event.button in (1, 3):
                     self.is_dragging_slider = False
+                    self.is_panning = False
+                    # Під час перетягування дерево могло бути намальоване не повністю
+                    if not self.tree_complete:
+                        self.needs_redraw = True
 
             # --- Обробка руху миші ---
             elif event.type == pygame.MOUSEMOTION:
                 if self.is_dragging_slider:
                     self._update_slider(event.pos)
+                elif self.is_panning:
+                    self.view_offset = (self.view_offset[0] + event.rel[0],
+                                        self.view_offset[1] + event.rel[1])
+                    self.needs_redraw = True
+
+            # --- Масштабування коліщатком миші відносно курсора ---
+            elif event.type == pygame.MOUSEWHEEL:
+                self._zoom_at(pygame.mouse.get_pos(), ZOOM_STEP ** event.y)
+
+            # --- Клавіша R повертає початковий вигляд ---
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                self.view_scale = 1.0
+                self.view_offset = (0.0, 0.0)
+                self.needs_redraw = True
 
         return True
 
+    def _zoom_at(self, mouse_pos, factor):
+        """Змінює масштаб у factor разів так, щоб точка під курсором лишилась на місці."""
+        self.view_scale *= factor
+        self.view_offset = (mouse_pos[0] - (mouse_pos[0] - self.view_offset[0]) * factor,
+                            mouse_pos[1] - (mouse_pos[1] - self.view_offset[1]) * factor)
+        self.needs_redraw = True
+
     def _update_slider(self, mouse_pos):
         """Оновлює значення кута нахилу на основі позиції миші."""
         # Обмежуємо позицію миші межами треку повзунка
@@ -153,19 +329,17 @@ class PythagorasTree:
             self.needs_redraw = True
 
     def draw(self):
-        """Основна функція для малювання всього на екрані."""
-        self.is_drawing = True  # Блокуємо інтерфейс
+        """
+        Основна функція для малювання всього на екрані.
 
-        self.screen.fill(self.COLOR_BLACK)
+        Дерево малюється на окрему поверхню лише тоді, коли змінились його параметри;
+        інакше готова поверхня просто копіюється на екран і поверх неї малюється інтерфейс.
+        """
+        self.is_drawing = True  # Блокуємо інтерфейс
 
-        # Малюємо дерево рекурсивно
-        self._draw_branch(
-            start_pos=self.start_pos,
-            angle=self.base_angle,
-            length=self.base_length,
-            level=self.recursion_level,
-            thickness=self.base_thickness
-        )
+        # Оновлюємо зображення дерева (за потреби) та переносимо його на екран
+        self._update_tree_surface()
+        self.screen.blit(self.tree_surface, (0, 0))
 
         # Малюємо інтерфейс
         self._draw_ui()
@@ -174,50 +348,112 @@ class PythagorasTree:
 
         self.is_drawing = False  # Розблоковуємо інтерфейс
 
-    def _draw_branch(self, start_pos, angle, length, level, thickness):
+    def _compute_geometry(self):
         """
-        Рекурсивна функція для малювання гілки та її нащадків.
+        Повертає (кешовану) геометрію дерева для поточних параметрів інтерфейсу.
 
-        Args:
-            start_pos (tuple): Початкові координати (x, y).
-            angle (float): Кут гілки в градусах (-90 = вгору).
-            length (float): Довжина гілки.
-            level (int): Поточний рівень рекурсії.
-            thickness (float): Товщина лінії для гілки.
+        Масштаб і зсув вигляду застосовуються до стовбура, тож геометрія одразу
+        обчислюється в екранних координатах: гілки поза вікном та коротші
+        за піксель відкидаються разом з нащадками.
         """
-        if level == 0 or length < 1:
-            return
-
-        # Розрахунок кінцевої точки гілки
-        angle_rad = math.radians(angle)
-        end_x = start_pos[0] + length * math.cos(angle_rad)
-        end_y = start_pos[1] + length * math.sin(angle_rad)
-        end_pos = (end_x, end_y)
-
-        # Малюємо поточну гілку
-        pygame.draw.line(self.screen, self.COLOR_PALE_GREEN, start_pos, end_pos, max(1, int(thickness)))
-
-        # --- Розрахунок параметрів для наступних двох гілок ---
-
-        # Кути розколу відносно поточної гілки
-        left_split_angle = 45 - self.tilt_angle
-        right_split_angle = 45 + self.tilt_angle
+        start_x = self.start_pos[0] * self.view_scale + self.view_offset[0]
+        start_y = self.start_pos[1] * self.view_scale + self.view_offset[1]
+        return cached_tree_geometry(
+            self.recursion_level,
+            (start_x, start_y),
+            self.base_angle,
+            self.base_length * self.view_scale,
+            self.base_thickness,
+            self.tilt_angle,
+            1,  # Гілки, коротші за піксель, не малюються
+            (0, 0, self.width, self.height)
+        )
 
-        # Нові абсолютні кути для гілок
-        new_angle_left = angle - left_split_angle
-        new_angle_right = angle + right_split_angle
+    def _cache_surface(self, key, surface):
+        """Зберігає готове зображення дерева в кеші, видаляючи найдавніше використані."""
+        self.surface_cache[key] = surface
+        self.surface_cache.move_to_end(key)
+        while len(self.surface_cache) > SURFACE_CACHE_SIZE:
+            self.surface_cache.popitem(last=False)
 
-        # Нові довжини гілок (за теоремою Піфагора)
-        # Коефіцієнт зменшення довжини - cos(кута розколу)
-        new_length_left = length * math.cos(math.radians(left_split_angle))
-        new_length_right = length * math.sin(math.radians(left_split_angle)) # sin(a) == cos(90-a)
+    def _update_tree_surface(self):
+        """
+        Готує self.tree_surface для поточних рівня та нахилу:
+        - готове зображення береться з кешу;
+        - якщо в кеші є дерево на рівень нижче, домальовується лише найглибший шар;
+        - інакше дерево малюється повністю, шар за шаром. Під час перетягування
+          повзунка чи вигляду малювання обмежене бюджетом кадру, а решта домальовується
+          після відпускання кнопки миші.
+        """
+        view = (self.view_scale, self.view_offset)
+        key = (self.recursion_level, self.tilt_angle, view)
+        if key == self.tree_key and self.tree_complete:
+            return
 
-        # Нова товщина (формула для "тюнінгу")
-        new_thickness = thickness * 0.80
+        # Бюджет кадру рахуємо від початку оновлення, включно з обчисленням геометрії
+        is_dragging = self.is_dragging_slider or self.is_panning
+        deadline = time.perf_counter() + DRAG_FRAME_BUDGET if is_dragging else None
+        level = self.recursion_level
+        previous_key = (level - 1, self.tilt_angle, view)
+        self.skipped_segments = self._compute_geometry()['skipped']
+
+        if key in self.surface_cache:
+            self.surface_cache.move_to_end(key)
+            surface = self.surface_cache[key]
+            complete = True
+        elif previous_key in self.surface_cache:
+            # Додано один рівень: домальовуємо тільки нові гілки
+            surface = self.surface_cache[previous_key].copy()
+            self._draw_layers(surface, self._compute_geometry(), level - 1, level)
+            complete = True
+        else:
+            geometry = self._compute_geometry()
+            surface = pygame.Surface((self.width, self.height))
+            surface.fill(self.COLOR_BLACK)
+            complete = self._draw_layers(surface, geometry, 0, level - 1, deadline)
+            if complete:
+                # Зберігаємо дерево без найглибшого шару - для швидкого зменшення рівня
+                if level > 1:
+                    self._cache_surface(previous_key, surface.copy())
+                complete = self._draw_layers(surface, geometry, level - 1, level, deadline)
+
+        if complete:
+            self._cache_surface(key, surface)
+        self.tree_surface = surface
+        self.tree_key = key
+        self.tree_complete = complete
+
+    def _draw_layers(self, surface, geometry, first, last, deadline=None):
+        """
+        Малює на поверхні гілки рівнів з first по last - 1 (0 - стовбур).
 
-        # Рекурсивні виклики для лівої та правої гілок
-        self._draw_branch(end_pos, new_angle_left, new_length_left, level - 1, new_thickness)
-        self._draw_branch(end_pos, new_angle_right, new_length_right, level - 1, new_thickness)
+        Args:
+            surface (pygame.Surface): Поверхня для малювання.
+            geometry (dict): Результат compute_tree_geometry.
+            first (int): Перший рівень для малювання.
+            last (int): Рівень, на якому малювання зупиняється (не включно).
+            deadline (float, optional): Момент time.perf_counter(), після якого
+                малювання переривається.
+
+        Returns:
+            bool: True, якщо всі шари намальовано повністю.
+        """
+        offsets = geometry['level_offsets']
+        segments = geometry['segments']
+        thickness = geometry['thickness']
+        # Гілки, що відсікаються за довжиною, можуть закінчитися раніше за last
+        last = min(last, len(offsets) - 1)
+        for depth in range(first, last):
+            start, end = offsets[depth], offsets[depth + 1]
+            # Усі гілки одного рівня мають однакову товщину
+            width = max(1, int(thickness[start]))
+            for chunk_start in range(start, end, LINES_PER_BUDGET_CHECK):
+                if deadline is not None and time.perf_counter() > deadline:
+                    return False
+                chunk = segments[chunk_start:min(end, chunk_start + LINES_PER_BUDGET_CHECK)].tolist()
+                for start_pos, end_pos in chunk:
+                    pygame.draw.line(surface, self.COLOR_PALE_GREEN, start_pos, end_pos, width)
+        return True
 
     def _draw_ui(self):
         """Малює всі елементи інтерфейсу."""
@@ -251,37 +487,119 @@ class PythagorasTree:
         handle_rect.centerx = handle_x
         pygame.draw.rect(self.screen, self.COLOR_WHITE, handle_rect, border_radius=3)
 
+        # --- Масштаб та статистика відсікання (LOD) ---
+        info_surf = self.font.render(
+            f"Масштаб: x{self.view_scale:.2f}   Відкинуто гілок: {self.skipped_segments:,}".replace(',', "'"),
+            True, self.COLOR_GRAY)
+        self.screen.blit(info_surf, (self.POS_RX1, 20))
+
 
 # Класичний метод.
 # Використовує PyPlot для візуалізації.
-def pythagoras_tree_pyplot(recursion_level):
-    """
-    Малює фрактал "Дерево Піфагора" за допомогою matplotlib.pyplot.
 
-    Ця функція створює статичне зображення дерева. Вона не є інтерактивною.
+# --- Параметри для налаштування візуалізації ---
+BG_COLOR          = 'black'
+BRANCH_COLOR      = 'lightgreen'
+INITIAL_LENGTH    = 100.0     # Початкова довжина стовбура
+INITIAL_THICKNESS = 5.0       # Початкова товщина стовбура
+MIN_LINEWIDTH     = 0.5       # Мінімальна товщина лінії на графіку
+START_POINT       = (0, -120) # Початок стовбура
+INITIAL_ANGLE     = 90        # Стовбур росте вгору
+LOD_MIN_PIXELS    = 1.0       # Гілки, коротші за стільки пікселів, відкидаються в режимі LOD
+
+
+def make_tree_collection(geometry, color=BRANCH_COLOR, cmap=None):
+    """
+    Створює одну LineCollection для всього дерева замість окремої лінії на кожну гілку.
 
     Args:
-        recursion_level (int): Глибина рекурсії (кількість ітерацій).
-        length_reduction_factor (float, optional): Коефіцієнт, на який множиться
-            довжина гілки на кожному наступному рівні рекурсії.
-            Класичне значення для симетричного дерева - cos(45°), тобто ~0.707.
+        geometry (dict): Результат compute_tree_geometry.
+        color: Колір гілок (якщо cmap не задано).
+        cmap (str, optional): Назва палітри matplotlib - тоді колір залежить від рівня гілки.
+
+    Returns:
+        LineCollection: Колекція з індивідуальними товщинами (та кольорами) гілок.
     """
-    # --- Параметри для налаштування візуалізації ---
-    BG_COLOR            = 'black'
-    BRANCH_COLOR        = 'lightgreen'
-    INITIAL_LENGTH      = 100.0  # Початкова довжина стовбура
-    INITIAL_THICKNESS   = 5.0    # Початкова товщина стовбура
-    THICKNESS_REDUCTION = 0.8    # Коефіцієнт зменшення товщини
-    SPLIT_ANGLE         = 45     # Кут розходження гілок (45° для симетричного дерева)
-    # Коефіцієнт зменшення довжини згідно з теоремою Піфагора
-    LENGTH_REDUCTION_FACTOR = math.cos(math.radians(SPLIT_ANGLE))
+    linewidths, colors = _collection_style(geometry, color, cmap)
+    return LineCollection(geometry['segments'], linewidths=linewidths, colors=colors,
+                          capstyle='round')
+
+
+def _collection_style(geometry, color=BRANCH_COLOR, cmap=None):
+    """Повертає товщини та кольори гілок для LineCollection."""
+    linewidths = np.maximum(MIN_LINEWIDTH, geometry['thickness'])
+    if cmap is None:
+        return linewidths, color
+    depth = geometry['depth']
+    return linewidths, plt.get_cmap(cmap)(depth / max(1, int(depth.max(initial=0))))
 
-    # Створення фігури та осей для малювання
-    fig, ax = plt.subplots(figsize=(10, 8), facecolor=BG_COLOR)
-    ax.set_facecolor(BG_COLOR)
-    ax.axis('off') # Вимкнути осі координат
-    ax.set_aspect('equal', adjustable='box') # Зберегти пропорції
 
+def enable_tree_lod(ax, recursion_level, tilt_angle=0.0, cmap=None, min_pixels=LOD_MIN_PIXELS):
+    """
+    Малює дерево в режимі деталізації (LOD): після кожної зміни меж осей
+    (масштабування чи переміщення інструментами вікна) геометрія обчислюється
+    наново лише для видимої області, а гілки, коротші за min_pixels пікселів,
+    відкидаються разом з нащадками. Кількість відкинутих гілок показується на графіку.
+
+    Args:
+        ax (plt.Axes): Осі для малювання.
+        recursion_level (int): Глибина рекурсії (можна 20+).
+        tilt_angle (float): Нахил дерева в градусах.
+        cmap (str, optional): Палітра для розфарбування гілок за рівнем.
+        min_pixels (float): Мінімальна довжина гілки на екрані.
+
+    Returns:
+        LineCollection: Колекція, що оновлюється при зміні меж.
+    """
+    collection = LineCollection([], capstyle='round')
+    ax.add_collection(collection, autolim=False)
+    info = ax.text(0.01, 0.01, '', transform=ax.transAxes, color='gray', fontsize=9)
+
+    def _update(_ax=None):
+        x_min, x_max = ax.get_xlim()
+        y_min, y_max = ax.get_ylim()
+        bbox = ax.get_window_extent()
+        units_per_pixel = max((x_max - x_min) / max(bbox.width, 1), (y_max - y_min) / max(bbox.height, 1))
+        geometry = compute_tree_geometry(recursion_level, START_POINT, INITIAL_ANGLE,
+                                         INITIAL_LENGTH, INITIAL_THICKNESS, tilt_angle,
+                                         min_length=min_pixels * units_per_pixel,
+                                         viewport=(x_min, y_min, x_max, y_max))
+        linewidths, colors = _collection_style(geometry, cmap=cmap)
+        collection.set_segments(geometry['segments'])
+        collection.set_linewidths(linewidths)
+        collection.set_colors(colors)
+        info.set_text(f"Гілок: {len(geometry['segments'])}, відкинуто: {geometry['skipped']}")
+
+    # Початкові межі - коло, в якому гарантовано лежить усе дерево
+    max_factor = max(math.cos(math.radians(SPLIT_ANGLE - tilt_angle)),
+                     math.cos(math.radians(SPLIT_ANGLE + tilt_angle)))
+    radius = INITIAL_LENGTH / (1 - max_factor)
+    ax.set_xlim(START_POINT[0] - radius, START_POINT[0] + radius)
+    ax.set_ylim(START_POINT[1] - radius * 0.1, START_POINT[1] + radius)
+    ax.callbacks.connect('xlim_changed', _update)
+    ax.callbacks.connect('ylim_changed', _update)
+    _update()
+    return collection
+
+
+def draw_tree_on_ax(ax, recursion_level, engine='numpy', render='collection', cmap=None,
+                    tilt_angle=0.0):
+    """
+    Малює дерево Піфагора на переданих осях.
+
+    Args:
+        ax (plt.Axes): Осі для малювання.
+        recursion_level (int): Глибина рекурсії (кількість ітерацій).
+        engine (str): 'numpy' - геометрія обчислюється векторно (compute_tree_geometry),
+            'recursive' - класичний рекурсивний обхід гілок.
+        render (str): 'collection' - усе дерево однією LineCollection,
+            'lines' - окремий ax.plot на кожну гілку. Рекурсивний рушій завжди малює лініями.
+        cmap (str, optional): Палітра для розфарбування гілок за рівнем (лише для 'collection').
+        tilt_angle (float): Нахил дерева в градусах (лише для рушія 'numpy').
+
+    Returns:
+        int: Кількість створених графічних об'єктів (artists).
+    """
     def _draw_branch_recursive(start_pos, angle, length, level, thickness):
         """
         Вкладена рекурсивна функція для малювання однієї гілки та її нащадків.
@@ -301,7 +619,7 @@ def pythagoras_tree_pyplot(recursion_level):
         # Малюємо лінію (гілку) на графіку
         ax.plot([start_pos[0], end_pos[0]], [start_pos[1], end_pos[1]],
                 color=BRANCH_COLOR,
-                linewidth=max(0.5, thickness))
+                linewidth=max(MIN_LINEWIDTH, thickness))
 
         # Розраховуємо параметри для двох нових гілок
         new_length = length * LENGTH_REDUCTION_FACTOR
@@ -312,28 +630,227 @@ def pythagoras_tree_pyplot(recursion_level):
         # Рекурсивний виклик для правої гілки
         _draw_branch_recursive(end_pos, angle + SPLIT_ANGLE, new_length, level - 1, new_thickness)
 
-    # Початковий виклик для стовбура дерева
-    # Починаємо з точки (0, -120) і малюємо вгору (кут 90°)
-    start_point = (0, -120)
-    initial_angle = 90
-    _draw_branch_recursive(start_point, initial_angle, INITIAL_LENGTH, recursion_level, INITIAL_THICKNESS)
+    artists_before = len(ax.lines) + len(ax.collections)
+    if engine == 'recursive':
+        _draw_branch_recursive(START_POINT, INITIAL_ANGLE, INITIAL_LENGTH, recursion_level, INITIAL_THICKNESS)
+    else:
+        geometry = compute_tree_geometry(recursion_level, START_POINT, INITIAL_ANGLE,
+                                         INITIAL_LENGTH, INITIAL_THICKNESS, tilt_angle)
+        if render == 'collection':
+            ax.add_collection(make_tree_collection(geometry, cmap=cmap))
+        else:
+            for (start_pos, end_pos), thickness in zip(geometry['segments'], geometry['thickness']):
+                ax.plot([start_pos[0], end_pos[0]], [start_pos[1], end_pos[1]],
+                        color=BRANCH_COLOR,
+                        linewidth=max(MIN_LINEWIDTH, thickness))
 
     # Встановлюємо межі, щоб дерево було видно повністю
     ax.autoscale_view()
+    return len(ax.lines) + len(ax.collections) - artists_before
+
+
+def pythagoras_tree_pyplot(recursion_level, engine='numpy', render='collection', cmap=None,
+                           tilt_angle=0.0, lod=False):
+    """
+    Малює фрактал "Дерево Піфагора" за допомогою matplotlib.pyplot.
+
+    Ця функція створює статичне зображення дерева. Вона не є інтерактивною.
+
+    Args:
+        recursion_level (int): Глибина рекурсії (кількість ітерацій).
+        engine (str): 'numpy' або 'recursive' (див. draw_tree_on_ax).
+        render (str): 'collection' (одна LineCollection) або 'lines' (ax.plot на гілку).
+        cmap (str, optional): Палітра для розфарбування гілок за рівнем.
+        tilt_angle (float): Нахил дерева в градусах.
+        lod (bool): Режим деталізації для масштабування глибоких дерев (див. enable_tree_lod).
+    """
+    # Створення фігури та осей для малювання
+    fig, ax = plt.subplots(figsize=(10, 8), facecolor=BG_COLOR)
+    ax.set_facecolor(BG_COLOR)
+    ax.axis('off') # Вимкнути осі координат
+    ax.set_aspect('equal', adjustable='box') # Зберегти пропорції
+
+    if lod:
+        enable_tree_lod(ax, recursion_level, tilt_angle, cmap)
+    else:
+        draw_tree_on_ax(ax, recursion_level, engine, render, cmap, tilt_angle)
 
     # Показуємо результат
     plt.show()
 
 
-if __name__ == "__main__":
-    # Запуск класичного методу з Matplotlib
-    # (закоментуйте да наступні рядки коду, щоб іншу реалізацію, інтерактивну з pygame)
+def benchmark_pyplot_rendering(levels=range(8, 19, 2), max_lines_level=14):
+    """
+    Порівнює рендеринг дерева окремими лініями (ax.plot на гілку) та однією
+    LineCollection: кількість графічних об'єктів, час побудови і час малювання.
+    Малювання виконується в пам'яті (Agg), без відкриття вікна.
 
-    pythagoras_tree_pyplot(recursion_level=10) # Значення більше 10-12 сповільнює рендеринг
-    exit(0)
+    Args:
+        levels: Рівні рекурсії для порівняння.
+        max_lines_level (int): Найбільший рівень для режиму 'lines' -
+            далі він працює хвилинами і пропускається.
 
-    # Запуск інтерактивного методу з PyGame
-    import pygame
+    Returns:
+        list[dict]: Результати вимірювань для кожної пари (рівень, режим).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    results = []
+    print("Рівень | Режим      | Об'єктів | Побудова, с | Малювання, с")
+    print('-' * 61)
+    for level in levels:
+        for render in ('lines', 'collection'):
+            if render == 'lines' and level > max_lines_level:
+                print(f"{level:>6} | {render:<10} | {'пропущено':>8}")
+                continue
+            fig = Figure(figsize=(10, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+            ax.set_aspect('equal', adjustable='box')
 
-    app = PythagorasTree()
-    app.run()
\ No newline at end of file
+            start = time.perf_counter()
+            artists = draw_tree_on_ax(ax, level, render=render)
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            fig.canvas.draw()
+            draw_time = time.perf_counter() - start
+
+            results.append({'level': level, 'render': render, 'artists': artists,
+                            'build_time': build_time, 'draw_time': draw_time})
+            print(f"{level:>6} | {render:<10} | {artists:>8} | {build_time:>11.3f} | {draw_time:>12.3f}")
+    return results
+
+
+# Пакетний (безвіконний) експорт зображень.
+# Використовує Agg/SVG-рендерери matplotlib без plt, тож не потребує дисплея.
+EXPORT_DPI = 100
+EXPORT_FORMATS = ('png', 'svg')
+
+
+def render_tree_image(path, recursion_level, tilt_angle=0.0, size=800, cmap=None):
+    """
+    Малює дерево без відкриття вікна та зберігає у файл (формат - за розширенням).
+
+    Args:
+        path (str): Шлях до файлу .png або .svg.
+        recursion_level (int): Глибина рекурсії.
+        tilt_angle (float): Нахил дерева в градусах.
+        size (int): Розмір квадратного зображення в пікселях.
+        cmap (str, optional): Палітра для розфарбування гілок за рівнем.
+
+    Returns:
+        str: Шлях до збереженого файлу.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(size / EXPORT_DPI, size / EXPORT_DPI), dpi=EXPORT_DPI, facecolor=BG_COLOR)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_facecolor(BG_COLOR)
+    ax.axis('off')
+    ax.set_aspect('equal', adjustable='datalim')
+    draw_tree_on_ax(ax, recursion_level, cmap=cmap, tilt_angle=tilt_angle)
+    fig.savefig(path, facecolor=BG_COLOR)
+    return path
+
+
+def export_tree_grid(output_dir, levels, tilt_angles=(0.0,), sizes=(800,), fmt='png',
+                     workers=None, cmap=None, progress=True):
+    """
+    Зберігає зображення дерева для всіх комбінацій (рівень × нахил × розмір),
+    розподіляючи роботу між процесами. Файли записуються на диск одразу
+    після готовності, а прогрес виводиться в міру завершення.
+
+    Args:
+        output_dir (str): Каталог для зображень (створюється за потреби).
+        levels: Рівні рекурсії.
+        tilt_angles: Кути нахилу в градусах.
+        sizes: Розміри зображень у пікселях.
+        fmt (str): 'png' або 'svg'.
+        workers (int, optional): Кількість процесів (за замовчуванням - кількість ядер).
+        cmap (str, optional): Палітра для розфарбування гілок за рівнем.
+        progress (bool): Виводити прогрес у консоль.
+
+    Returns:
+        list[str]: Шляхи до збережених файлів у порядку завершення.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Непідтримуваний формат: {fmt!r} (доступні: {', '.join(EXPORT_FORMATS)})")
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [
+        (os.path.join(output_dir, f"tree_L{level:02d}_T{tilt:+05.1f}_S{size}.{fmt}"), level, tilt, size)
+        for level in levels for tilt in tilt_angles for size in sizes
+    ]
+    saved = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_tree_image, path, level, tilt, size, cmap)
+                   for path, level, tilt, size in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            saved.append(future.result())
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r[{done}/{len(jobs)}] {done / elapsed:6.1f} зобр./с  {os.path.basename(saved[-1])}",
+                      end='', flush=True)
+    if progress:
+        print()
+    return saved
+
+
+def _float_range(text):
+    """
+    Розбирає аргумент командного рядка 'початок:кінець:крок' або список через кому.
+    """
+    if ':' in text:
+        start, stop, step = (float(part) for part in text.split(':'))
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [float(part) for part in text.split(',')]
+
+
+def _int_list(text):
+    """Розбирає список цілих чисел через кому."""
+    return [int(part) for part in text.split(',')]
+
+
+def main(argv=None):
+    """
+    Точка входу з аргументами командного рядка:
+    pyplot (статичне зображення), pygame (інтерактивне вікно) або export (пакетний експорт).
+    """
+    parser = argparse.ArgumentParser(description="Дерево Піфагора")
+    parser.add_argument('mode', nargs='?', choices=('pyplot', 'pygame', 'export'), default='pyplot')
+    parser.add_argument('--level', type=int, default=10, help="рівень рекурсії для pyplot")
+    parser.add_argument('--levels', type=_int_list, default=[8, 10, 12], help="рівні для export, напр. 8,10,12")
+    parser.add_argument('--tilts', type=_float_range, default=[0.0], help="нахили для export: --tilts=-30:30:5 або --tilts=0,10")
+    parser.add_argument('--sizes', type=_int_list, default=[800], help="розміри (px) для export, напр. 400,800")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='png')
+    parser.add_argument('--output', default='tree_frames', help="каталог для export")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cmap', default=None, help="палітра matplotlib для кольору гілок")
+    parser.add_argument('--lod', action='store_true', help="відсікання невидимих гілок для pyplot (масштабування)")
+    args = parser.parse_args(argv)
+
+    if args.mode == 'export':
+        export_tree_grid(args.output, args.levels, args.tilts, args.sizes, args.format,
+                         args.workers, args.cmap)
+    elif args.mode == 'pygame':
+        # Запуск інтерактивного методу з PyGame
+        global pygame
+        import pygame
+
+        app = PythagorasTree()
+        app.run()
+    else:
+        # Запуск класичного методу з Matplotlib.
+        # Дерево малюється однією LineCollection, тож глибокі рівні (16-18) теж прийнятні
+        # (порівняння режимів рендерингу - benchmark_pyplot_rendering())
+        pythagoras_tree_pyplot(recursion_level=args.level, cmap=args.cmap, lod=args.lod)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,26 @@
 # Очистка консолі
 print('\033c', end='')
 
+import argparse
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
+import csv
 import heapq
+import inspect
+import itertools
+import mmap
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 # --- 1. Набір даних та Мапування ---
 # Глобальний словник для мапування літер (ключ) на повну назву завдання (значення)
@@ -106,9 +123,9 @@ def visualize_graph(G, pos=None, start_node=None, title="Граф Залежно
 
     # Визначення позицій вершин для стабільної візуалізації
     if pos is None:
-        # Якщо позиція не передана (хоча вона повинна бути хардкодована), 
-        # повертаємося до spring_layout як резервного варіанту.
-        pos = nx.spring_layout(G, k=0.8, iterations=50) 
+        # Якщо позиція не передана, беремо автоматичне шарове розміщення -
+        # воно обчислюється один раз для структури графа і далі береться з кешу.
+        pos = cached_graph_layout(G)
 
     # Налаштування кольорів та розмірів для всіх вершин
     if node_colors is None:
@@ -184,6 +201,477 @@ def visualize_graph(G, pos=None, start_node=None, title="Граф Залежно
     # Пауза для відображення змін
     plt.pause(0.25)
 
+# --- 2.1. Швидкий рендерер анімації Дейкстри (blitting) ---
+ANIMATION_INTERVAL = 0.25   # Пауза між кроками в інтерактивному режимі (с)
+ANIMATION_FPS = 4           # Кадрів за секунду у збереженому відео
+ANIMATION_FIGSIZE = (20, 12)
+ANIMATION_DPI = 100
+GIF_COLORS = 128            # Розмір палітри кадрів GIF
+
+
+def dijkstra_step_frame(G, state, step_num):
+    """
+    Перетворює стан dijkstra_step_by_step_generator на опис кадру: кольори
+    вершин і ребер (у порядку G.nodes() / G.edges()), мітки відстаней і заголовок.
+    Опис - звичайний словник, тож його можна передати в інший процес.
+    """
+    node_colors = []
+    distance_labels = {}
+    for node in G.nodes():
+        distance = state['distances'][node]
+        distance_labels[node] = f"{distance:.0f}" if distance != float('inf') else 'inf'
+        if node in state['visited'] and node != state['current_node']:
+            node_colors.append('#BBBBBB')  # Закриті/фіналізовані (LightGray)
+        elif node == state['current_node']:
+            node_colors.append('#FFA07A')  # Активно оброблювана (LightSalmon)
+        elif distance != float('inf'):
+            node_colors.append('#FFFFE0')  # У черзі (LightYellow)
+        else:
+            node_colors.append('#ADD8E6')  # Не відвідані (LightBlue)
+
+    relaxed = set(state['processed_edges'])
+    edge_colors = ['red' if edge in relaxed else '#AAAAAA' for edge in G.edges()]
+
+    if state['current_node']:
+        current_distance = state['distances'][state['current_node']]
+        title = f"Крок {step_num}: Обробка вузла {state['current_node']} (відстань: {current_distance})"
+    elif step_num == 1:
+        title = "Крок 1: Ініціалізація (A=0, решта=inf)"
+    else:
+        title = f"Крок {step_num}: Алгоритм завершено. Фінальні відстані знайдено."
+
+    return {'node_colors': node_colors, 'edge_colors': edge_colors,
+            'distance_labels': distance_labels, 'title': title, 'path_text': None}
+
+
+def shortest_path_frame(G, state, start, end):
+    """
+    Опис фінального кадру з підсвіченим найкоротшим шляхом start -> end
+    або None, якщо end недосяжна.
+    """
+    if end not in state['predecessors']:
+        return None
+    shortest_path = reconstruct_path(state['predecessors'], start, end)
+    path_nodes = set(shortest_path)
+    path_edges = set(zip(shortest_path, shortest_path[1:]))
+    frame = dijkstra_step_frame(G, state, 0)
+    frame.update(
+        node_colors=['#90EE90' if node in path_nodes else '#BBBBBB' for node in G.nodes()],
+        edge_colors=['#226622' if edge in path_edges else '#AAAAAA' for edge in G.edges()],
+        title=(f"ФІНАЛ: Найкоротший шлях до {end} ({TASK_MAP.get(end, end)}) знайдено! "
+               f"Час: {state['distances'][end]:.0f}"),
+        path_text=" -> ".join(shortest_path),
+    )
+    return frame
+
+
+class _RasterLayer(Artist):
+    """
+    Готовий растр RGBA, що накладається на фігуру без масштабування й інтерполяції
+    (на відміну від FigureImage) - лише в межах непрозорої частини.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pixels = None
+        self.offset = (0, 0)
+
+    def set_pixels(self, rgba):
+        """Запам'ятовує рядки/стовпці rgba (рядок 0 - верх фігури), де є хоч один непрозорий піксель."""
+        rows = np.flatnonzero(rgba[..., 3].any(axis=1))
+        cols = np.flatnonzero(rgba[..., 3].any(axis=0))
+        if not len(rows):
+            self.pixels = None
+            return
+        # draw_image очікує рядки знизу вгору і відлічує y від низу фігури
+        self.pixels = rgba[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1][::-1].copy()
+        self.offset = (cols[0], rgba.shape[0] - rows[-1] - 1)
+
+    def draw(self, renderer):
+        if self.pixels is None or not self.get_visible():
+            return
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, *self.offset, self.pixels)
+        gc.restore()
+
+
+class DijkstraAnimator:
+    """
+    Рендерер кроків Дейкстри, що створює всі художники (artists) matplotlib один раз.
+
+    На кожному кроці змінюються лише кольори вершин/ребер і тексти міток, а
+    перемальовуються тільки анімовані художники поверх збереженого фону
+    (blitting) - без plt.clf() та повторного виклику networkx. Статичні частини
+    (легенда) потрапляють у фон; при зміні розміру вікна фон знімається заново.
+    Статичні літери вершин і ваги ребер лежать над анімованими вершинами й
+    ребрами, тому вони один раз растеризуються в прозорий шар-зображення, який
+    накладається за кадр одним викликом замість перемальовування кожного тексту.
+    """
+
+    def __init__(self, G, pos=None, fig=None, start_node=None):
+        """
+        Args:
+            G (nx.DiGraph): Граф, що анімується (порядок вершин і ребер фіксується тут).
+            pos (dict): Позиції вершин (None - автоматичне cached_graph_layout).
+            fig (optional): Фігура matplotlib; без неї створюється нова через pyplot.
+            start_node (optional): Початкова вершина (для кольору першого кадру).
+        """
+        self.G = G
+        if pos is None:
+            pos = cached_graph_layout(G)
+        self.fig = fig if fig is not None else plt.figure(figsize=ANIMATION_FIGSIZE)
+        self.canvas = self.fig.canvas
+        ax = self.ax = self.fig.add_axes((0, 0, 1, 0.94))
+        ax.set_axis_off()
+
+        node_colors = ['#ADD8E6' if node == start_node else '#B0C4DE' for node in G.nodes()]
+        self.node_artist = nx.draw_networkx_nodes(G, pos, ax=ax, node_color=node_colors, node_size=2000,
+                                                  edgecolors='#333333', linewidths=1.5, alpha=0.9)
+        edge_artists = nx.draw_networkx_edges(G, pos, ax=ax, edge_color='#AAAAAA', width=1.5,
+                                              arrowsize=20, alpha=0.6, node_size=2000,
+                                              min_target_margin=25, min_source_margin=25)
+        # Для графа без стрілок networkx повертає одну LineCollection замість списку патчів
+        self.edge_artists = edge_artists if isinstance(edge_artists, list) else [edge_artists]
+        self.letter_artists = nx.draw_networkx_labels(G, pos, ax=ax, font_size=14,
+                                                      font_color='black', font_weight='bold')
+        self.weight_artists = nx.draw_networkx_edge_labels(G, pos, ax=ax,
+                                                           edge_labels=nx.get_edge_attributes(G, 'weight'),
+                                                           font_color='#777777', font_size=10)
+        label_pos_extra = {k: (v[0], v[1] - 0.25) for k, v in pos.items()}
+        self.distance_artists = nx.draw_networkx_labels(G, label_pos_extra, ax=ax,
+                                                        labels={node: '' for node in G.nodes()},
+                                                        font_size=9, font_color='darkred', font_weight='bold')
+        self.title_artist = self.fig.text(0.5, 0.97, '', ha='center', va='center', fontsize=20, color='#333333')
+        self.path_artist = self.fig.text(0.02, 0.02, '', fontsize=10, verticalalignment='bottom',
+                                         bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.9, edgecolor='gray'))
+
+        legend_text = "ЛЕГЕНДА ЗАВДАНЬ:"
+        for short in G.nodes():
+            full = get_full_name(short)
+            legend_text += f"\n{short}: {full.split(' - ')[-1]}"
+        self.fig.text(0.02, 0.98, legend_text, fontsize=10, verticalalignment='top',
+                      bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.9, edgecolor='gray'))
+
+        # Літери та ваги не змінюються: вони малюються лише в шар self.label_layer
+        self.static_labels = [*self.letter_artists.values(), *self.weight_artists.values()]
+        for artist in self.static_labels:
+            artist.set_visible(False)
+        self.label_layer = _RasterLayer()
+        self.fig.add_artist(self.label_layer)
+
+        # Порядок малювання анімованих художників повторює порядок networkx:
+        # ребра -> вершини -> (шар літер і ваг) -> відстані -> заголовок і шлях
+        self.animated = ([*self.edge_artists, self.node_artist, self.label_layer,
+                          *self.distance_artists.values(), self.title_artist, self.path_artist])
+        for artist in self.animated:
+            artist.set_animated(True)
+
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+
+    def _on_draw(self, event):
+        """Після повного перемальовування (перший показ, зміна розміру) знімає новий фон і шар міток."""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._render_label_layer()
+        self._draw_animated()
+
+    def _render_label_layer(self):
+        """Растеризує статичні мітки на прозоре полотно розміру фігури (з поточним dpi)."""
+        from matplotlib.backends.backend_agg import RendererAgg
+        width, height = self.canvas.get_width_height(physical=True)
+        renderer = RendererAgg(width, height, self.fig.dpi)
+        for artist in self.static_labels:
+            artist.set_visible(True)
+            artist.draw(renderer)
+            artist.set_visible(False)
+        self.label_layer.set_pixels(np.asarray(renderer.buffer_rgba()))
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            self.fig.draw_artist(artist)
+
+    def update(self, frame):
+        """Застосовує опис кадру (dijkstra_step_frame) і перемальовує лише анімовані художники."""
+        self.node_artist.set_facecolor(frame['node_colors'])
+        if len(self.edge_artists) == self.G.number_of_edges():
+            for artist, color in zip(self.edge_artists, frame['edge_colors']):
+                artist.set_color(color)
+        else:
+            self.edge_artists[0].set_color(frame['edge_colors'])
+        for node, text in frame['distance_labels'].items():
+            self.distance_artists[node].set_text(text)
+        self.title_artist.set_text(frame['title'])
+        path_text = frame.get('path_text')
+        self.path_artist.set_text(f"НАЙКОРОТШИЙ ШЛЯХ:\n{path_text}" if path_text else '')
+        self.path_artist.set_visible(bool(path_text))
+
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def show(self, frame, interval=ANIMATION_INTERVAL):
+        """
+        Показує кадр у вікні та обробляє події GUI протягом interval секунд.
+        На відміну від plt.pause(), не викликає повного перемальовування фігури.
+        """
+        self.update(frame)
+        self.canvas.flush_events()
+        if interval:
+            self.canvas.start_event_loop(interval)
+
+    def to_rgba(self, frame):
+        """Рендерить кадр і повертає сирі пікселі RGBA (bytes) разом з розміром (ширина, висота)."""
+        self.update(frame)
+        width, height = self.canvas.get_width_height(physical=True)
+        return bytes(self.canvas.buffer_rgba()), (width, height)
+
+
+# Рендерер і формат файлу, задані процесу пулу один раз при запуску
+_worker_animator = None
+_worker_format = None
+
+
+def _init_animation_worker(G, pos, figsize, dpi, fmt):
+    """Створює в процесі пулу фігуру на Agg-полотні (без GUI) та рендерер для неї."""
+    global _worker_animator, _worker_format
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    _worker_animator = DijkstraAnimator(G, pos, fig=fig)
+    _worker_format = fmt
+
+
+def _render_animation_frame(frame):
+    """
+    Рендерить кадр у процесі пулу. Для GIF тут же зводить його до палітри -
+    квантування найдорожча частина запису GIF, тож воно теж виконується паралельно.
+    """
+    data, size = _worker_animator.to_rgba(frame)
+    if _worker_format == '.gif':
+        from PIL import Image
+        image = Image.frombuffer('RGBA', size, data, 'raw', 'RGBA', 0, 1).convert('RGB')
+        return image.quantize(colors=GIF_COLORS, method=Image.Quantize.FASTOCTREE), size
+    return data, size
+
+
+def _write_gif(path, frames, size, fps):
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=round(1000 / fps), loop=0)
+
+
+def _find_ffmpeg():
+    from matplotlib import rcParams
+    ffmpeg = shutil.which(rcParams['animation.ffmpeg_path'])
+    if ffmpeg is None:
+        raise RuntimeError("Для збереження MP4 потрібен ffmpeg (rcParams['animation.ffmpeg_path'])")
+    return ffmpeg
+
+
+def _write_mp4(path, frames, size, fps):
+    ffmpeg = _find_ffmpeg()
+    width, height = size
+    command = [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+               '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+               # yuv420p вимагає парних розмірів кадру
+               '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+        for data in frames:
+            process.stdin.write(data)
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg завершився з кодом {process.returncode}")
+
+
+def export_dijkstra_animation(G, frames, path, pos=None, fps=ANIMATION_FPS, workers=None,
+                              figsize=ANIMATION_FIGSIZE, dpi=ANIMATION_DPI):
+    """
+    Зберігає послідовність кадрів у GIF або MP4 (за розширенням path) без GUI та пауз.
+    Кадри рендеряться паралельно: кожен процес пулу один раз будує фігуру і далі
+    лише оновлює кольори та мітки.
+
+    Args:
+        G (nx.DiGraph): Граф.
+        frames (list[dict]): Описи кадрів (dijkstra_step_frame / shortest_path_frame).
+        path (str): Шлях до файлу '.gif' або '.mp4'.
+        pos (dict, optional): Позиції вершин (None - автоматичне cached_graph_layout).
+        workers (int, optional): Кількість процесів (None - за кількістю ядер).
+
+    Returns:
+        int: Кількість записаних кадрів.
+    """
+    writers = {'.gif': _write_gif, '.mp4': _write_mp4}
+    extension = path[path.rfind('.'):].lower() if '.' in path else ''
+    if extension not in writers:
+        raise ValueError(f"Непідтримуваний формат '{extension}', очікується .gif або .mp4")
+    if pos is None:
+        pos = cached_graph_layout(G)  # Один раз у батьківському процесі, а не в кожному процесі пулу
+    if extension == '.mp4':
+        _find_ffmpeg()  # Перевіряємо до рендерингу, а не після нього
+    frames = list(frames)
+    if not frames:
+        return 0
+
+    size = None
+    rendered = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_animation_worker,
+                             initargs=(G, pos, figsize, dpi, extension)) as executor:
+        # map зберігає порядок кадрів незалежно від того, який процес завершив першим
+        for data, size in executor.map(_render_animation_frame, frames, chunksize=max(1, len(frames) // 32)):
+            rendered.append(data)
+    writers[extension](path, rendered, size, fps)
+    return len(rendered)
+
+
+# --- 2.2. Автоматичне шарове (Sugiyama) розміщення для довільних DAG ---
+LAYOUT_CACHE_SIZE = 16      # Скільки розміщень (по одному на структуру графа) зберігати
+CROSSING_SWEEPS = 8         # Кількість проходів (вниз + вгору) зменшення перетинів
+LAYER_SPACING = 1.0         # Відстань між шарами по X (як у INITIAL_POS)
+NODE_SPACING = 2.0          # Відстань між сусідніми вершинами шару по Y
+
+_layout_cache = OrderedDict()
+
+
+def graph_structure_key(G):
+    """
+    Ключ структури графа для кешу розміщень: не залежить від порядку додавання
+    вершин і ребер, але змінюється при додаванні/видаленні будь-якого з них.
+    Ваги ребер на розміщення не впливають і в ключ не входять.
+    """
+    return (G.number_of_nodes(), G.number_of_edges(),
+            hash(frozenset(G.nodes())), hash(frozenset(G.edges())))
+
+
+def _barycenter_sweep(layers, neighbors, position):
+    """
+    Один прохід методу барицентрів: вершини кожного шару впорядковуються за
+    середньою позицією сусідів у попередньому шарі (вершини без сусідів
+    лишаються на місці). Сортування стабільне, тож порядок не "стрибає".
+    """
+    for layer in layers[1:]:
+        keys = {}
+        for node in layer:
+            adjacent = neighbors[node]
+            keys[node] = (sum(position[n] for n in adjacent) / len(adjacent)) if adjacent else position[node]
+        layer.sort(key=keys.__getitem__)
+        for index, node in enumerate(layer):
+            position[node] = index
+
+
+def _count_crossings(layers, down, position):
+    """Кількість перетинів ребер між сусідніми шарами (сортування + підрахунок інверсій)."""
+    crossings = 0
+    for layer in layers[:-1]:
+        targets = [position[v] for u in layer for v in sorted(down[u], key=position.__getitem__)]
+        # Підрахунок інверсій деревом Фенвіка за O(E log V)
+        size = max(targets, default=-1) + 2
+        tree = [0] * size
+        for seen, target in enumerate(targets):
+            i = target + 1
+            not_greater = 0
+            while i > 0:
+                not_greater += tree[i]
+                i -= i & -i
+            crossings += seen - not_greater
+            i = target + 1
+            while i < size:
+                tree[i] += 1
+                i += i & -i
+    return crossings
+
+
+def layered_layout(G, sweeps=CROSSING_SWEEPS, layer_spacing=LAYER_SPACING, node_spacing=NODE_SPACING):
+    """
+    Шарове розміщення DAG у стилі Sugiyama (зліва направо, як INITIAL_POS):
+
+    1. Шар вершини - її топологічна глибина (найдовший шлях від джерела в ребрах).
+    2. Ребра через кілька шарів розбиваються фіктивними вершинами, щоб довгі
+       залежності мали власну "доріжку" і брали участь у зменшенні перетинів.
+    3. Порядок у шарах - метод барицентрів проходами вниз і вгору; зберігається
+       найкращий за кількістю перетинів варіант.
+
+    Returns:
+        dict: {вершина: (x, y)} - x = шар * layer_spacing, шари центровані по y.
+
+    Raises:
+        ValueError: Якщо граф містить цикл.
+    """
+    order = topological_order(G)
+    depth = {}
+    for node in order:
+        depth[node] = max((depth[p] + 1 for p in G.pred[node]), default=0)
+
+    # Внутрішні цілі ідентифікатори: справжні вершини 0..n-1, фіктивні - далі
+    index = {node: i for i, node in enumerate(order)}
+    layer_of = [depth[node] for node in order]
+    up = [[] for _ in order]
+    down = [[] for _ in order]
+    for u, v in G.edges():
+        previous = index[u]
+        for layer in range(depth[u] + 1, depth[v]):
+            dummy = len(layer_of)
+            layer_of.append(layer)
+            up.append([previous])
+            down.append([])
+            down[previous].append(dummy)
+            previous = dummy
+        down[previous].append(index[v])
+        up[index[v]].append(previous)
+
+    layers = [[] for _ in range(max(layer_of, default=-1) + 1)]
+    for node, layer in enumerate(layer_of):
+        layers[layer].append(node)
+    position = [0] * len(layer_of)
+    for layer in layers:
+        for i, node in enumerate(layer):
+            position[node] = i
+
+    best_crossings = _count_crossings(layers, down, position)
+    best_layers = [list(layer) for layer in layers]
+    for _ in range(sweeps):
+        if best_crossings == 0:
+            break
+        _barycenter_sweep(layers, up, position)
+        _barycenter_sweep(layers[::-1], down, position)
+        crossings = _count_crossings(layers, down, position)
+        if crossings >= best_crossings:
+            break
+        best_crossings = crossings
+        best_layers = [list(layer) for layer in layers]
+
+    pos = {}
+    for layer_number, layer in enumerate(best_layers):
+        middle = (len(layer) - 1) / 2
+        for i, node in enumerate(layer):
+            if node < len(order):
+                pos[order[node]] = (layer_number * layer_spacing, (middle - i) * node_spacing)
+    return pos
+
+
+def cached_graph_layout(G):
+    """
+    Розміщення графа з кешем за structure hash: шарове для DAG, для графів з
+    циклами - spring_layout з фіксованим seed. Обчислюється один раз для кожної
+    структури, а не на кожному кадрі.
+
+    Returns:
+        dict: Копія кешованих позицій {вершина: (x, y)}.
+    """
+    key = graph_structure_key(G)
+    pos = _layout_cache.get(key)
+    if pos is None:
+        try:
+            pos = layered_layout(G)
+        except ValueError:
+            pos = {node: (float(x), float(y)) for node, (x, y) in nx.spring_layout(G, k=0.8, iterations=50, seed=0).items()}
+        _layout_cache[key] = pos
+        if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    else:
+        _layout_cache.move_to_end(key)
+    return dict(pos)
+
+
 # Функція для відновлення шляху на основі попередників
 def reconstruct_path(predecessors, start, end):
     """Відновлює найкоротший шлях від 'end' до 'start' за словником попередників."""
@@ -277,9 +765,1508 @@ def dijkstra_step_by_step_generator(G, source):
         'predecessors'   : predecessors.copy() 
     }
 
+# --- 3.1. Компактне CSR-представлення графа ---
+class CSRGraph:
+    """
+    Заморожений (незмінний) орієнтований граф у форматі CSR (Compressed Sparse Row):
+    вершини пронумеровані цілими числами 0..n-1, а вихідні ребра вершини i - це
+    targets[offsets[i]:offsets[i + 1]] з вагами weights[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, nodes, offsets, targets, weights):
+        """
+        Args:
+            nodes: Мітки вершин у порядку їхніх індексів.
+            offsets (array): Масив довжини n + 1 з початками списків суміжності.
+            targets (array): Індекси кінцевих вершин ребер.
+            weights (array): Ваги ребер.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_networkx(cls, G, weight='weight', default_weight=1):
+        """
+        Заморожує граф networkx (наприклад, з create_task_graph) у CSR за O(V + E).
+
+        Args:
+            G (nx.DiGraph): Вихідний граф.
+            weight (str): Назва атрибута ваги ребра.
+            default_weight (float): Вага ребер без атрибута.
+
+        Returns:
+            CSRGraph: Новий граф.
+        """
+        nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        offsets = array('q', [0])
+        targets = array('q')
+        weight_values = []
+        for node in nodes:
+            for neighbor, data in G[node].items():
+                targets.append(index[neighbor])
+                weight_values.append(data.get(weight, default_weight))
+            offsets.append(len(targets))
+        # Цілі ваги (як тривалості завдань) зберігаємо цілими, інакше - дійсними
+        is_integer = all(type(value) is int for value in weight_values)
+        weights = array('q' if is_integer else 'd', weight_values)
+        return cls(nodes, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, nodes, sources, targets, weights):
+        """
+        Будує CSR з паралельних масивів ребер (у довільному порядку) сортуванням
+        підрахунком за O(V + E).
+
+        Args:
+            nodes: Мітки вершин у порядку їхніх індексів.
+            sources, targets (array): Індекси початкових і кінцевих вершин ребер.
+            weights (array): Ваги ребер (typecode 'q' або 'd').
+
+        Returns:
+            CSRGraph: Новий граф.
+        """
+        num_nodes = len(nodes)
+        offsets = array('q', [0]) * (num_nodes + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(num_nodes):
+            offsets[i + 1] += offsets[i]
+        cursor = array('q', offsets[:-1])
+        sorted_targets = array('q', [0]) * len(targets)
+        sorted_weights = array(weights.typecode, [0]) * len(weights)
+        for source, target, weight in zip(sources, targets, weights):
+            position = cursor[source]
+            sorted_targets[position] = target
+            sorted_weights[position] = weight
+            cursor[source] = position + 1
+        return cls(nodes, offsets, sorted_targets, sorted_weights)
+
+    def to_networkx(self, weight='weight'):
+        """Розморожує граф у nx.DiGraph (наприклад, для візуалізації)."""
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes)
+        nodes, offsets, targets, weights = self.nodes, self.offsets, self.targets, self.weights
+        G.add_weighted_edges_from(
+            ((nodes[i], nodes[targets[j]], weights[j])
+             for i in range(len(nodes)) for j in range(offsets[i], offsets[i + 1])),
+            weight=weight)
+        return G
+
+    def __getstate__(self):
+        """
+        Для передачі в процеси пулу масиви, відображені з файлу (memoryview над mmap),
+        копіюються у звичайні array - самі відображення серіалізувати не можна.
+        """
+        state = self.__dict__.copy()
+        for name in ('offsets', 'targets', 'weights'):
+            values = state[name]
+            if isinstance(values, memoryview):
+                copied = array(values.format)
+                copied.frombytes(values.cast('B'))
+                state[name] = copied
+        return state
+
+    def __len__(self):
+        """Кількість вершин."""
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        """Кількість ребер."""
+        return len(self.targets)
+
+    def to_labels(self, distances, predecessors):
+        """
+        Перетворює результати за індексами на словники за мітками вершин
+        (лише досяжні вершини, як у dijkstra).
+        """
+        nodes = self.nodes
+        infinity = float('inf')
+        label_distances = {}
+        label_predecessors = {}
+        for i, distance in enumerate(distances):
+            if distance != infinity:
+                label_distances[nodes[i]] = distance
+                label_predecessors[nodes[i]] = nodes[predecessors[i]] if predecessors[i] >= 0 else None
+        return label_distances, label_predecessors
+
+
+def freeze_graph(G, weight='weight', default_weight=1):
+    """Заморожує граф networkx у CSRGraph (див. CSRGraph.from_networkx)."""
+    return CSRGraph.from_networkx(G, weight, default_weight)
+
+
+# --- 3.2. Потокова (дельта) версія Дейкстри без копіювання стану ---
+# Інтервал (у кроках) між повними знімками стану для відтворення трасування
+CHECKPOINT_INTERVAL = 4096
+
+
+def _queue_operations(queue):
+    """
+    Повертає (push(елемент, пріоритет), pop() -> (пріоритет, елемент), черга)
+    для черги спільного інтерфейсу (LazyHeapQueue, IndexedHeap, BucketQueue).
+    Без черги - heapq з лінивим видаленням: застарілі записи лишаються в купі,
+    і ядро пропускає їх за множиною вже зафіксованих вершин.
+    """
+    if queue is not None:
+        return queue.push, queue.pop, queue
+    heap = []
+
+    def push(item, priority):
+        heapq.heappush(heap, (priority, item))
+
+    def pop():
+        return heapq.heappop(heap)
+
+    return push, pop, heap
+
+
+def _dijkstra_core(G, source, distances, predecessors, trace=True, queue=None):
+    """
+    Спільне ядро алгоритму Дейкстри.
+
+    Оновлює передані словники distances та predecessors на місці (у них потрапляють
+    лише досяжні вершини) і після фіксації кожної вершини повертає через yield
+    кортеж (вершина, відстань, релаксації), де релаксації - список
+    (сусід, нова відстань) або None, якщо trace=False.
+    queue - об'єкт черги з пріоритетами (див. _queue_operations), за замовчуванням heapq.
+    """
+    push, pop, pending = _queue_operations(queue)
+    distances[source] = 0
+    predecessors[source] = None
+    push(source, 0)
+    visited_nodes = set()
+    infinity = float('inf')
+
+    while pending:
+        current_distance, current_node = pop()
+        if current_node in visited_nodes:
+            continue
+        visited_nodes.add(current_node)
+
+        relaxed = [] if trace else None
+        for neighbor, data in G[current_node].items():
+            new_distance = current_distance + data.get('weight', 1)
+            if new_distance < distances.get(neighbor, infinity):
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_node
+                push(neighbor, new_distance)
+                if trace:
+                    relaxed.append((neighbor, new_distance))
+
+        yield current_node, current_distance, relaxed
+
+
+def _dijkstra_core_csr(csr, source, distances, predecessors, trace=True, queue=None):
+    """
+    Ядро алгоритму Дейкстри для CSRGraph: працює з цілими індексами вершин
+    та плоскими масивами замість словників networkx.
+
+    distances - список відстаней (float('inf') для недосяжних), predecessors -
+    масив індексів попередників (-1, якщо попередника немає). Обидва оновлюються
+    на місці. Через yield повертає (індекс вершини, відстань, релаксації).
+    queue - як у _dijkstra_core.
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    push, pop, pending = _queue_operations(queue)
+    distances[source] = 0
+    push(source, 0)
+    visited_nodes = bytearray(len(csr))
+
+    while pending:
+        current_distance, current_node = pop()
+        if visited_nodes[current_node]:
+            continue
+        visited_nodes[current_node] = 1
+
+        relaxed = [] if trace else None
+        start, end = offsets[current_node], offsets[current_node + 1]
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
+            new_distance = current_distance + weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_node
+                push(neighbor, new_distance)
+                if trace:
+                    relaxed.append((neighbor, new_distance))
+
+        yield current_node, current_distance, relaxed
+
+
+def dijkstra_csr(csr, source_index, queue=None):
+    """
+    Алгоритм Дейкстри безпосередньо на CSRGraph, без перетворення міток вершин.
+
+    Args:
+        csr (CSRGraph): Заморожений граф.
+        source_index (int): Індекс початкової вершини.
+        queue (optional): Об'єкт черги з пріоритетами (за замовчуванням heapq).
+
+    Returns:
+        tuple: (distances, predecessors) - список відстаней за індексами
+            (inf для недосяжних) та масив індексів попередників (-1 - немає).
+    """
+    distances = [float('inf')] * len(csr)
+    predecessors = array('q', [-1]) * len(csr)
+    for _ in _dijkstra_core_csr(csr, source_index, distances, predecessors, trace=False, queue=queue):
+        pass
+    return distances, predecessors
+
+
+def dijkstra(G, source, queue=None):
+    """
+    Швидкий алгоритм Дейкстри без трасування (те саме ядро, що й у дельта-режимі).
+    Приймає як граф networkx, так і заморожений CSRGraph.
+
+    Args:
+        G: Граф networkx або CSRGraph.
+        source: Початкова вершина.
+        queue (optional): Черга з пріоритетами - назва ('lazy', 'indexed', 'bucket')
+            або готовий об'єкт черги (після виклику в ньому лишаються лічильники stats).
+            Без неї використовується heapq з лінивим видаленням.
+
+    Returns:
+        tuple: (distances, predecessors) - словники лише для досяжних вершин.
+    """
+    if isinstance(queue, str):
+        queue = make_priority_queue(queue, G)
+    if isinstance(G, CSRGraph):
+        return G.to_labels(*dijkstra_csr(G, G.index[source], queue=queue))
+    distances, predecessors = {}, {}
+    for _ in _dijkstra_core(G, source, distances, predecessors, trace=False, queue=queue):
+        pass
+    return distances, predecessors
+
+
+def dijkstra_delta_generator(G, source):
+    """
+    Генератор подій алгоритму Дейкстри, що повертає лише зміни, а не повний стан.
+    Сумарний обсяг подій - O(V + E) замість O(V²) у dijkstra_step_by_step_generator.
+
+    Події:
+        {'event': 'init', 'step': 0, 'source': s, 'nodes': (усі вершини,)}
+        {'event': 'settle', 'step': k, 'node': u, 'distance': d,
+         'relaxed': [(сусід, нова відстань), ...]}  - ребра (u, сусід) релаксовано
+        {'event': 'done', 'step': k + 1}
+    """
+    if isinstance(G, CSRGraph):
+        yield {'event': 'init', 'step': 0, 'source': source, 'nodes': tuple(G.nodes)}
+        labels = G.nodes
+        core = (
+            (labels[node], distance, [(labels[neighbor], value) for neighbor, value in relaxed])
+            for node, distance, relaxed in _dijkstra_core_csr(
+                G, G.index[source], [float('inf')] * len(G), array('q', [-1]) * len(G))
+        )
+    else:
+        yield {'event': 'init', 'step': 0, 'source': source, 'nodes': tuple(G.nodes())}
+        core = _dijkstra_core(G, source, {}, {}, trace=True)
+
+    step = 0
+    for node, distance, relaxed in core:
+        step += 1
+        yield {'event': 'settle', 'step': step, 'node': node, 'distance': distance, 'relaxed': relaxed}
+    yield {'event': 'done', 'step': step + 1}
+
+
+class DijkstraReplay:
+    """
+    Відтворювач трасування з dijkstra_delta_generator: зберігає лише дельти та
+    повні знімки стану кожні checkpoint_interval кроків, а стан будь-якого кроку
+    відновлює від найближчого попереднього знімка.
+    """
+
+    def __init__(self, events, checkpoint_interval=CHECKPOINT_INTERVAL):
+        """
+        Args:
+            events: Ітерований потік подій dijkstra_delta_generator.
+            checkpoint_interval (int): Кількість кроків між знімками стану.
+        """
+        self.checkpoint_interval = checkpoint_interval
+        self.nodes = ()
+        self.source = None
+        self.settled = []  # (вершина, відстань, релаксації) для кроків 1..n
+        self.checkpoints = {0: ({}, {})}  # {крок: (відстані, попередники)}
+
+        distances, predecessors = {}, {}
+        for event in events:
+            if event['event'] == 'init':
+                self.nodes = event['nodes']
+                self.source = event['source']
+                distances[self.source] = 0
+                predecessors[self.source] = None
+                self.checkpoints = {0: (distances.copy(), predecessors.copy())}
+            elif event['event'] == 'settle':
+                node = event['node']
+                self.settled.append((node, event['distance'], event['relaxed']))
+                for neighbor, new_distance in event['relaxed']:
+                    distances[neighbor] = new_distance
+                    predecessors[neighbor] = node
+                if len(self.settled) % checkpoint_interval == 0:
+                    self.checkpoints[len(self.settled)] = (distances.copy(), predecessors.copy())
+
+        self.final_distances = distances
+        self.final_predecessors = predecessors
+
+    def __len__(self):
+        """Кількість кроків (зафіксованих вершин)."""
+        return len(self.settled)
+
+    def state(self, step):
+        """
+        Відновлює повний стан кроку step у форматі dijkstra_step_by_step_generator
+        і в тій самій точці: 0 - ініціалізація, 1..len(self) - щойно зафіксована
+        вершина, len(self) + 1 - фінальний стан. Як і в генераторі, distances та
+        predecessors кроку k - це стан ДО релаксацій кроку k (самі релаксовані
+        ребра - у processed_edges), тож replay можна підставити замість генератора.
+
+        Raises:
+            IndexError: Якщо кроку не існує.
+        """
+        last_step = len(self.settled) + 1
+        if not 0 <= step <= last_step:
+            raise IndexError(f"Крок {step} поза межами трасування (0..{last_step})")
+
+        # Кількість кроків, чиї релаксації вже застосовані
+        applied = max(step - 1, 0)
+        base_step = applied - applied % self.checkpoint_interval
+        base_distances, base_predecessors = self.checkpoints[base_step]
+        distances = dict.fromkeys(self.nodes, float('inf'))
+        distances.update(base_distances)
+        predecessors = dict.fromkeys(self.nodes)
+        predecessors.update(base_predecessors)
+
+        for node, _, relaxed in self.settled[base_step:applied]:
+            for neighbor, new_distance in relaxed:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = node
+
+        current_node = self.settled[step - 1][0] if 0 < step < last_step else None
+        return {
+            'distances'      : distances,
+            'visited'        : {node for node, _, _ in self.settled[:min(step, last_step - 1)]},
+            'current_node'   : current_node,
+            'processed_edges': [(current_node, neighbor) for neighbor, _ in self.settled[step - 1][2]]
+                               if current_node is not None else [],
+            'predecessors'   : predecessors
+        }
+
+    def states(self):
+        """Усі стани по черзі - та сама послідовність, що й у dijkstra_step_by_step_generator."""
+        for step in range(len(self.settled) + 2):
+            yield self.state(step)
+
+
+def check_replay_matches_generator(G, source, checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Перевіряє крок за кроком, що DijkstraReplay.states() збігається з
+    dijkstra_step_by_step_generator (однакові відстані, попередники, відвідані
+    вершини та релаксовані ребра в кожному стані).
+
+    Returns:
+        int: Кількість порівняних станів.
+    """
+    replay = DijkstraReplay(dijkstra_delta_generator(G, source), checkpoint_interval)
+    count = 0
+    for step, (expected, actual) in enumerate(
+            itertools.zip_longest(dijkstra_step_by_step_generator(G, source), replay.states())):
+        assert expected == actual, f"Крок {step}: відтворений стан відрізняється від генератора"
+        count += 1
+    return count
+
+# --- 3.3. Черги з пріоритетами для алгоритму Дейкстри ---
+# Усі черги мають спільний інтерфейс:
+#   push(item, priority) - додає елемент або зменшує його пріоритет (якщо новий менший);
+#   pop() -> (priority, item) - вилучає елемент з найменшим пріоритетом;
+#   len(queue) - кількість елементів; stats - лічильники операцій.
+
+def _new_queue_stats():
+    """Порожні лічильники операцій черги."""
+    return {'pushes': 0, 'pops': 0, 'decrease_keys': 0, 'stale_pops': 0, 'max_size': 0}
+
+
+class LazyHeapQueue:
+    """
+    Черга на heapq з лінивим видаленням (як у dijkstra_step_by_step_generator):
+    зменшення пріоритету додає дублікат, а застарілі записи пропускаються під час pop.
+    Розмір купи може сягати O(E).
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.best = {}      # Найменший відомий пріоритет кожного елемента
+        self.popped = set() # Вже вилучені елементи
+        self.stats = _new_queue_stats()
+
+    def __len__(self):
+        return len(self.best) - len(self.popped)
+
+    def push(self, item, priority):
+        if item in self.popped:
+            return
+        if item in self.best:
+            if priority >= self.best[item]:
+                return
+            self.stats['decrease_keys'] += 1
+        self.best[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+        self.stats['pushes'] += 1
+        self.stats['max_size'] = max(self.stats['max_size'], len(self.heap))
+
+    def pop(self):
+        while True:
+            priority, item = heapq.heappop(self.heap)
+            if item in self.popped or priority > self.best[item]:
+                self.stats['stale_pops'] += 1
+                continue
+            self.popped.add(item)
+            self.stats['pops'] += 1
+            return priority, item
+
+
+class IndexedHeap:
+    """
+    Індексована двійкова купа зі справжнім зменшенням ключа (decrease-key):
+    кожен елемент присутній у купі не більше одного разу, тож її розмір ≤ V.
+    Просіювання переміщує "дірку" замість обмінів на кожному рівні.
+    """
+
+    def __init__(self):
+        self.heap = []      # Елементи в порядку купи
+        self.priority = {}  # Пріоритети елементів, що зараз у купі
+        self.position = {}  # Індекс кожного елемента в self.heap
+        self.stats = _new_queue_stats()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item, priority):
+        if item in self.position:
+            if priority >= self.priority[item]:
+                return
+            self.priority[item] = priority
+            self.stats['decrease_keys'] += 1
+            self._sift_up(self.position[item])
+            return
+        self.priority[item] = priority
+        self.heap.append(item)
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        self.stats['pushes'] += 1
+        self.stats['max_size'] = max(self.stats['max_size'], len(self.heap))
+
+    def pop(self):
+        heap = self.heap
+        root = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        del self.position[root]
+        self.stats['pops'] += 1
+        return self.priority.pop(root), root
+
+    def _sift_up(self, index):
+        heap, priority, position = self.heap, self.priority, self.position
+        item = heap[index]
+        item_priority = priority[item]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_item = heap[parent]
+            if priority[parent_item] <= item_priority:
+                break
+            # Батьківський елемент опускається в "дірку"
+            heap[index] = parent_item
+            position[parent_item] = index
+            index = parent
+        heap[index] = item
+        position[item] = index
+
+    def _sift_down(self, index):
+        heap, priority, position = self.heap, self.priority, self.position
+        size = len(heap)
+        item = heap[index]
+        item_priority = priority[item]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and priority[heap[right]] < priority[heap[child]]:
+                child = right
+            child_item = heap[child]
+            if priority[child_item] >= item_priority:
+                break
+            # Менший нащадок піднімається в "дірку"
+            heap[index] = child_item
+            position[child_item] = index
+            index = child
+        heap[index] = item
+        position[item] = index
+
+
+class BucketQueue:
+    """
+    Циклічна черга з кошиками (алгоритм Діала) для невід'ємних цілих пріоритетів,
+    що зростають монотонно, а різниця між ними не перевищує max_weight - як
+    відстані в Дейкстрі з малими цілими вагами (тривалості завдань у create_task_graph).
+    push, pop та decrease-key виконуються за O(1) (амортизовано O(1 + max_weight) на pop).
+    """
+
+    def __init__(self, max_weight):
+        """
+        Args:
+            max_weight (int): Найбільша вага ребра графа.
+        """
+        self.size = int(max_weight) + 1
+        self.buckets = [{} for _ in range(self.size)]  # dict як впорядкована множина
+        self.priority = {}
+        self.current = None  # Пріоритет останнього вилученого елемента - нижня межа черги
+        self.stats = _new_queue_stats()
+
+    def __len__(self):
+        return len(self.priority)
+
+    def push(self, item, priority):
+        if self.current is None:
+            self.current = priority
+        if not self.current <= priority <= self.current + self.size - 1:
+            raise ValueError(f"Пріоритет {priority} поза вікном черги [{self.current}, "
+                             f"{self.current + self.size - 1}]")
+        if item in self.priority:
+            old_priority = self.priority[item]
+            if priority >= old_priority:
+                return
+            del self.buckets[old_priority % self.size][item]
+            self.stats['decrease_keys'] += 1
+        else:
+            self.stats['pushes'] += 1
+        self.priority[item] = priority
+        self.buckets[priority % self.size][item] = None
+        self.stats['max_size'] = max(self.stats['max_size'], len(self.priority))
+
+    def pop(self):
+        if not self.priority:
+            raise IndexError("pop з порожньої черги")
+        while not self.buckets[self.current % self.size]:
+            self.current += 1
+        bucket = self.buckets[self.current % self.size]
+        item = next(iter(bucket))
+        del bucket[item]
+        self.stats['pops'] += 1
+        return self.priority.pop(item), item
+
+
+PRIORITY_QUEUES = ('lazy', 'indexed', 'bucket')
+
+
+def _max_edge_weight(G):
+    """Найбільша вага ребра графа networkx або CSRGraph."""
+    if isinstance(G, CSRGraph):
+        return max(G.weights, default=0)
+    return max((data.get('weight', 1) for _, _, data in G.edges(data=True)), default=0)
+
+
+def make_priority_queue(kind, G=None):
+    """
+    Створює чергу з пріоритетами за назвою.
+
+    Args:
+        kind (str): 'lazy', 'indexed' або 'bucket'.
+        G (optional): Граф, з якого для 'bucket' визначається найбільша вага.
+
+    Raises:
+        ValueError: Невідома черга або 'bucket' для нецілих ваг.
+    """
+    if kind == 'lazy':
+        return LazyHeapQueue()
+    if kind == 'indexed':
+        return IndexedHeap()
+    if kind == 'bucket':
+        max_weight = _max_edge_weight(G)
+        if int(max_weight) != max_weight:
+            raise ValueError("Черга з кошиками потребує цілих ваг ребер")
+        return BucketQueue(max_weight)
+    raise ValueError(f"Невідома черга: {kind!r} (доступні: {', '.join(PRIORITY_QUEUES)})")
+
+
+def compare_priority_queues(G, source, kinds=PRIORITY_QUEUES):
+    """
+    Запускає Дейкстру з кожною чергою на одному графі та виводить час і лічильники.
+
+    Returns:
+        dict: {назва черги: лічильники stats разом з часом 'time' (с)}.
+    """
+    results = {}
+    print(f"{'Черга':<8} | {'час, с':>7} | {'push':>8} | {'pop':>8} | {'decrease':>8} | {'застарілі':>9} | {'макс. розмір':>12}")
+    reference = None
+    for kind in kinds:
+        queue = make_priority_queue(kind, G)
+        start = time.perf_counter()
+        distances, _ = dijkstra(G, source, queue=queue)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = distances
+        assert distances == reference, "Черги дали різні відстані"
+        stats = dict(queue.stats, time=elapsed)
+        results[kind] = stats
+        print(f"{kind:<8} | {elapsed:7.3f} | {stats['pushes']:>8} | {stats['pops']:>8} | "
+              f"{stats['decrease_keys']:>8} | {stats['stale_pops']:>9} | {stats['max_size']:>12}")
+    return results
+
+
+# --- 3.4. Порівняння швидкодії реалізацій ---
+def make_random_graph(num_edges, avg_degree=4, max_weight=20, seed=0):
+    """
+    Створює випадковий орієнтований граф з num_edges ребрами та цілими вагами.
+    Вершина 0 з'єднана ланцюжком з усіма іншими, тож усі вершини досяжні.
+    """
+    rng = random.Random(seed)
+    num_nodes = max(2, num_edges // avg_degree)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(num_nodes))
+    for u in range(num_nodes - 1):
+        G.add_edge(u, u + 1, weight=rng.randint(1, max_weight))
+    # G.number_of_edges() рахує ребра за O(V), тому ведемо лічильник самі
+    edge_count = num_nodes - 1
+    while edge_count < num_edges:
+        u, v = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if u != v and not G.has_edge(u, v):
+            G.add_edge(u, v, weight=rng.randint(1, max_weight))
+            edge_count += 1
+    return G
+
+
+def benchmark_shortest_paths(edge_counts=(10**4, 10**5, 10**6), max_generator_nodes=5000):
+    """
+    Порівнює час пошуку всіх найкоротших відстаней від однієї вершини:
+    покроковий генератор, dijkstra на networkx, dijkstra на CSRGraph
+    (окремо - час заморожування) та nx.single_source_dijkstra_path_length.
+
+    Args:
+        edge_counts: Кількості ребер синтетичних графів.
+        max_generator_nodes (int): Найбільший граф для покрокового генератора -
+            він копіює стан на кожному кроці (O(V²)) і далі пропускається.
+
+    Returns:
+        list[dict]: Час (с) кожної реалізації для кожного графа.
+    """
+    results = []
+    print(f"{'Ребер':>8} | {'Вершин':>7} | {'генератор':>9} | {'dict':>6} | {'заморож.':>8} | {'CSR':>6} | {'networkx':>8}")
+    for num_edges in edge_counts:
+        G = make_random_graph(num_edges)
+        row = {'edges': G.number_of_edges(), 'nodes': G.number_of_nodes()}
+
+        if G.number_of_nodes() <= max_generator_nodes:
+            start = time.perf_counter()
+            for _ in dijkstra_step_by_step_generator(G, 0):
+                pass
+            row['generator'] = time.perf_counter() - start
+        else:
+            row['generator'] = None
+
+        start = time.perf_counter()
+        expected, _ = dijkstra(G, 0)
+        row['dict'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        csr = freeze_graph(G)
+        row['freeze'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        distances, _ = dijkstra(csr, 0)
+        row['csr'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = nx.single_source_dijkstra_path_length(G, 0)
+        row['networkx'] = time.perf_counter() - start
+
+        assert distances == expected == reference, "Реалізації дали різні відстані"
+        results.append(row)
+        generator = f"{row['generator']:9.3f}" if row['generator'] is not None else f"{'пропущено':>9}"
+        print(f"{row['edges']:>8} | {row['nodes']:>7} | {generator} | {row['dict']:6.3f} | "
+              f"{row['freeze']:8.3f} | {row['csr']:6.3f} | {row['networkx']:8.3f}")
+    return results
+
+# --- 3.5. Сервіс запитів найкоротших шляхів з кешем ---
+SSSP_CACHE_SIZE = 256  # Скільки дерев найкоротших шляхів (по одному на джерело) зберігати
+# Менше відсутніх джерел обчислюються в поточному процесі: запуск пулу (і передача
+# графа кожному процесу) коштує більше, ніж кілька проходів Дейкстри
+SSSP_PARALLEL_MIN_SOURCES = 16
+
+# Граф, переданий процесу-обробнику один раз при запуску пулу
+_worker_graph = None
+
+
+def _init_sssp_worker(csr):
+    """Ініціалізує процес пулу замороженим графом."""
+    global _worker_graph
+    _worker_graph = csr
+
+
+def _sssp_worker(source):
+    """
+    Обчислює дерево найкоротших шляхів від source у процесі пулу.
+    Повертає масиви за індексами - вони передаються між процесами значно дешевше за словники.
+    """
+    return source, dijkstra_csr(_worker_graph, _worker_graph.index[source])
+
+
+class ShortestPathService:
+    """
+    Сервіс відповідей на запити "найкоротший шлях з X в Y" на одному графі.
+
+    Дерева найкоротших шляхів (відстані та попередники за індексами CSR-копії
+    графа) від кожного джерела зберігаються в LRU-кеші обмеженого розміру. Будь-яка зміна графа через
+    методи сервісу (або повідомлення mark_changed) збільшує лічильник версії,
+    і всі закешовані дерева стають недійсними. Великі пакети відсутніх джерел
+    обчислюються паралельно в пулі процесів, який створюється один раз на
+    версію графа (закрити його - close() або with).
+    """
+
+    def __init__(self, G, cache_size=SSSP_CACHE_SIZE, workers=None):
+        """
+        Args:
+            G: Граф networkx (наприклад, з create_task_graph) або вже заморожений
+                CSRGraph (з load_graph / load_graph_binary) - його сервіс не копіює,
+                але й змінювати через add_edge / remove_edge / set_weight не може.
+            cache_size (int): Максимальна кількість закешованих джерел.
+            workers (int, optional): Кількість процесів для пакетних запитів
+                (0 - обчислювати в поточному процесі).
+        """
+        self.G = G
+        self.cache_size = cache_size
+        self.workers = workers
+        self.version = 0
+        self.cache = OrderedDict()  # {джерело: (версія, відстані, попередники)} за індексами
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._csr = None
+        self._csr_version = None
+        self._pool = None
+        self._pool_version = None
+
+    def close(self):
+        """Зупиняє пул процесів (якщо його було запущено)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Зміни графа ---
+    def mark_changed(self):
+        """Повідомляє сервіс про зміну графа поза його методами."""
+        self.version += 1
+        self.stats['invalidations'] += 1
+        self.cache.clear()
+
+    def _mutable_graph(self):
+        if isinstance(self.G, CSRGraph):
+            raise TypeError("CSRGraph не змінюється: передайте сервісу граф networkx")
+        return self.G
+
+    def add_edge(self, u, v, weight=1):
+        """Додає (або оновлює) ребро u -> v з вагою weight."""
+        self._mutable_graph().add_edge(u, v, weight=weight)
+        self.mark_changed()
+
+    def remove_edge(self, u, v):
+        """Видаляє ребро u -> v."""
+        self._mutable_graph().remove_edge(u, v)
+        self.mark_changed()
+
+    def set_weight(self, u, v, weight):
+        """Змінює вагу наявного ребра u -> v."""
+        self._mutable_graph()[u][v]['weight'] = weight
+        self.mark_changed()
+
+    # --- Запити ---
+    def _frozen_graph(self):
+        """Повертає CSR-копію графа для поточної версії (заморожується один раз на версію)."""
+        if isinstance(self.G, CSRGraph):
+            return self.G
+        if self._csr_version != self.version:
+            self._csr = freeze_graph(self.G)
+            self._csr_version = self.version
+        return self._csr
+
+    def _executor(self):
+        """Пул процесів із графом поточної версії; після зміни графа старий пул зупиняється."""
+        if self._pool is None or self._pool_version != self.version:
+            self.close()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_sssp_worker,
+                                             initargs=(self._frozen_graph(),))
+            self._pool_version = self.version
+        return self._pool
+
+    def _store(self, source, tree):
+        """Додає дерево в кеш, витісняючи найдавніше використане."""
+        self.cache[source] = (self.version, *tree)
+        self.cache.move_to_end(source)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _indexed_tree(self, source, count=True):
+        """Повертає дерево за індексами з кешу або обчислює його (count - врахувати в stats)."""
+        entry = self.cache.get(source)
+        if entry is not None and entry[0] == self.version:
+            self.cache.move_to_end(source)
+            if count:
+                self.stats['hits'] += 1
+            return entry[1], entry[2]
+        if count:
+            self.stats['misses'] += 1
+        csr = self._frozen_graph()
+        tree = dijkstra_csr(csr, csr.index[source])
+        self._store(source, tree)
+        return tree
+
+    def tree(self, source):
+        """
+        Повертає (distances, predecessors) для джерела у форматі dijkstra
+        (словники за мітками вершин, лише досяжні вершини).
+        """
+        return self._frozen_graph().to_labels(*self._indexed_tree(source))
+
+    def _query(self, source, target, count=True):
+        """
+        Відповідь на один запит: (відстань, шлях) з одного звернення до кешу,
+        тож запит враховується в stats рівно одним попаданням або промахом.
+        """
+        distances, predecessors = self._indexed_tree(source, count)
+        csr = self._frozen_graph()
+        current = csr.index[target]
+        distance = distances[current]
+        if distance == float('inf'):
+            return distance, []
+        path = []
+        while current >= 0:
+            path.append(csr.nodes[current])
+            current = predecessors[current]
+        path.reverse()
+        return distance, path
+
+    def distance(self, source, target):
+        """Довжина найкоротшого шляху (inf, якщо target недосяжна)."""
+        return self._query(source, target)[0]
+
+    def path(self, source, target):
+        """Найкоротший шлях як список вершин (порожній, якщо target недосяжна)."""
+        return self._query(source, target)[1]
+
+    def _missing(self, sources):
+        """Джерела без актуального дерева в кеші (без повторів, у порядку появи)."""
+        return [source for source in dict.fromkeys(sources)
+                if source not in self.cache or self.cache[source][0] != self.version]
+
+    def prefetch(self, sources):
+        """
+        Обчислює дерева для всіх відсутніх у кеші джерел, паралельно в пулі процесів.
+        Кількість джерел, що одночасно тримаються в кеші, обмежена cache_size.
+        """
+        missing = self._missing(sources)
+        self.stats['misses'] += len(missing)
+        self._compute(missing)
+
+    def _compute(self, missing):
+        """Обчислює й кешує дерева для джерел missing (без оновлення stats)."""
+        if not missing:
+            return
+        if self.workers == 0 or len(missing) < SSSP_PARALLEL_MIN_SOURCES:
+            csr = self._frozen_graph()
+            for source in missing:
+                self._store(source, dijkstra_csr(csr, csr.index[source]))
+            return
+        trees = self._executor().map(_sssp_worker, missing, chunksize=max(1, len(missing) // 64))
+        for source, tree in trees:
+            self._store(source, tree)
+
+    def query_many(self, pairs):
+        """
+        Відповідає на пакет запитів (джерело, ціль).
+
+        Кожна пара враховується в stats одним попаданням або промахом - так само,
+        як послідовні виклики _query (перший запит до відсутнього джерела - промах).
+
+        Returns:
+            list[tuple]: (відстань, шлях) для кожної пари в тому ж порядку.
+        """
+        pairs = list(pairs)
+        answers = [None] * len(pairs)
+        by_source = {}
+        for i, (source, _) in enumerate(pairs):
+            by_source.setdefault(source, []).append(i)
+        # Джерела обробляються порціями, що вміщуються в кеш
+        sources = list(by_source)
+        for start in range(0, len(sources), self.cache_size):
+            batch = sources[start:start + self.cache_size]
+            missing = self._missing(batch)
+            self._compute(missing)
+            missing = set(missing)
+            for source in batch:
+                for i in by_source[source]:
+                    if source in missing:
+                        missing.discard(source)
+                        self.stats['misses'] += 1
+                    else:
+                        self.stats['hits'] += 1
+                    answers[i] = self._query(source, pairs[i][1], count=False)
+        return answers
+
+
+# --- 3.6. Критичний шлях та розклад проєкту (найдовші шляхи в DAG) ---
+def topological_order(G):
+    """
+    Топологічне сортування алгоритмом Кана за O(V + E).
+
+    Raises:
+        ValueError: Якщо граф містить цикл.
+    """
+    in_degree = {node: len(G.pred[node]) for node in G.nodes()}
+    ready = [node for node, degree in in_degree.items() if degree == 0]
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for successor in G.succ[node]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+    if len(order) != len(in_degree):
+        raise ValueError("Граф містить цикл - топологічний порядок неможливий")
+    return order
+
+
+class CriticalPathSchedule:
+    """
+    Розклад проєкту на DAG залежностей, де вага ребра u -> v - час, що має
+    минути після початку u до початку v (як у create_task_graph).
+
+    За один топологічний прохід (O(V + E)) обчислюються найраніші початки
+    (найдовший шлях від початку проєкту) та "хвости" - найдовші шляхи до кінця.
+    Звідси найпізніші початки, резерв часу (slack) і критичний шлях.
+    Після зміни ваги одного ребра перераховуються лише вершини, значення
+    яких справді змінилися (нащадки v для початків, предки u для хвостів).
+    """
+
+    def __init__(self, G, weight='weight'):
+        """
+        Args:
+            G (nx.DiGraph): Ациклічний граф залежностей.
+            weight (str): Назва атрибута тривалості на ребрі.
+
+        Raises:
+            ValueError: Якщо граф містить цикл.
+        """
+        self.G = G
+        self.weight = weight
+        self.order = topological_order(G)
+        self.position = {node: i for i, node in enumerate(self.order)}
+        self.sinks = [node for node in self.order if not G.succ[node]]
+        self.earliest = {}
+        self.tail = {}
+        for node in self.order:
+            self.earliest[node] = self._compute_earliest(node)
+        for node in reversed(self.order):
+            self.tail[node] = self._compute_tail(node)
+
+    def _edge_weight(self, u, v):
+        return self.G[u][v].get(self.weight, 1)
+
+    def _compute_earliest(self, node):
+        """Найраніший початок вершини за вже відомими початками попередників."""
+        return max((self.earliest[p] + self._edge_weight(p, node) for p in self.G.pred[node]), default=0)
+
+    def _compute_tail(self, node):
+        """Найдовший шлях від вершини до кінця проєкту за відомими хвостами наступників."""
+        return max((self._edge_weight(node, s) + self.tail[s] for s in self.G.succ[node]), default=0)
+
+    @property
+    def project_duration(self):
+        """Тривалість проєкту - найраніший початок найпізнішого кінцевого завдання."""
+        return max((self.earliest[node] for node in self.sinks), default=0)
+
+    def earliest_start(self, node):
+        return self.earliest[node]
+
+    def latest_start(self, node):
+        return self.project_duration - self.tail[node]
+
+    def slack(self, node):
+        """Резерв часу: на скільки можна відкласти початок без зсуву кінця проєкту."""
+        return self.latest_start(node) - self.earliest[node]
+
+    def schedule(self):
+        """
+        Returns:
+            dict: {вершина: {'earliest_start', 'latest_start', 'slack'}} у топологічному порядку.
+        """
+        duration = self.project_duration
+        return {
+            node: {
+                'earliest_start': self.earliest[node],
+                'latest_start'  : duration - self.tail[node],
+                'slack'         : duration - self.tail[node] - self.earliest[node],
+            }
+            for node in self.order
+        }
+
+    def critical_path(self):
+        """
+        Повертає один критичний шлях (вершини з нульовим резервом, з'єднані "щільними" ребрами).
+        """
+        duration = self.project_duration
+        current = next((node for node in self.order
+                        if not self.G.pred[node] and self.tail[node] == duration), None)
+        path = []
+        while current is not None:
+            path.append(current)
+            current = next((s for s in self.G.succ[current]
+                            if self.earliest[current] + self._edge_weight(current, s) == self.earliest[s]
+                            and self.earliest[s] + self.tail[s] == duration), None)
+        return path
+
+    def update_weight(self, u, v, weight):
+        """
+        Змінює вагу ребра u -> v і інкрементно оновлює розклад.
+
+        Returns:
+            int: Кількість перерахованих вершин.
+        """
+        self.G[u][v][self.weight] = weight
+        touched = 0
+
+        # Найраніші початки змінюються лише в нащадків v - обробляємо в топологічному порядку
+        queue = [(self.position[v], v)]
+        queued = {v}
+        while queue:
+            _, node = heapq.heappop(queue)
+            touched += 1
+            new_value = self._compute_earliest(node)
+            if new_value != self.earliest[node]:
+                self.earliest[node] = new_value
+                for successor in self.G.succ[node]:
+                    if successor not in queued:
+                        queued.add(successor)
+                        heapq.heappush(queue, (self.position[successor], successor))
+
+        # Хвости змінюються лише в предків u - обробляємо у зворотному топологічному порядку
+        queue = [(-self.position[u], u)]
+        queued = {u}
+        while queue:
+            _, node = heapq.heappop(queue)
+            touched += 1
+            new_value = self._compute_tail(node)
+            if new_value != self.tail[node]:
+                self.tail[node] = new_value
+                for predecessor in self.G.pred[node]:
+                    if predecessor not in queued:
+                        queued.add(predecessor)
+                        heapq.heappush(queue, (-self.position[predecessor], predecessor))
+        return touched
+
+    def what_if(self, u, v, weight):
+        """
+        Тривалість проєкту та критичний шлях за іншої ваги ребра u -> v.
+        Розклад і граф після виклику повертаються до початкового стану.
+
+        Returns:
+            tuple: (тривалість, критичний шлях).
+        """
+        old_weight = self._edge_weight(u, v)
+        self.update_weight(u, v, weight)
+        result = (self.project_duration, self.critical_path())
+        self.update_weight(u, v, old_weight)
+        return result
+
+
+# --- 3.7. Запити між двома вершинами: рання зупинка, двобічна Дейкстра, A* ---
+def _point_to_point_result(distance, path, settled):
+    """Спільний формат відповіді для запитів між двома вершинами."""
+    return {'distance': distance, 'path': path, 'settled': settled}
+
+
+def dijkstra_point_to_point(G, source, target):
+    """
+    Дейкстра з ранньою зупинкою: пошук завершується, щойно фіксується target.
+
+    Returns:
+        dict: {'distance': відстань або inf, 'path': список вершин ([] - шляху немає),
+               'settled': кількість зафіксованих вершин}.
+    """
+    distances, predecessors = {}, {}
+    settled = 0
+    for node, distance, _ in _dijkstra_core(G, source, distances, predecessors, trace=False):
+        settled += 1
+        if node == target:
+            return _point_to_point_result(distance, reconstruct_path(predecessors, source, target), settled)
+    return _point_to_point_result(float('inf'), [], settled)
+
+
+def bidirectional_dijkstra(G, source, target, weight='weight'):
+    """
+    Двобічна Дейкстра: прямий пошук від source по G.succ і зворотний від target
+    по G.pred, на кожному кроці розширюється менша черга. Пошук зупиняється,
+    коли сума вершин обох черг не менша за найкращий знайдений шлях.
+
+    Returns:
+        dict: Той самий формат, що й у dijkstra_point_to_point
+              ('settled' - сумарно в обох напрямках).
+    """
+    infinity = float('inf')
+    if source == target:
+        return _point_to_point_result(0, [source], 1)
+
+    # Індекс 0 - прямий напрямок, 1 - зворотний
+    adjacency = (G.succ, G.pred)
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})
+    queues = ([(0, source)], [(0, target)])
+    visited = (set(), set())
+    best, meeting = infinity, None
+    settled = 0
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, current_node = heapq.heappop(queues[side])
+        if current_node in visited[side]:
+            continue
+        visited[side].add(current_node)
+        settled += 1
+
+        own, other = distances[side], distances[1 - side]
+        for neighbor, data in adjacency[side][current_node].items():
+            new_distance = current_distance + data.get(weight, 1)
+            if new_distance < own.get(neighbor, infinity):
+                own[neighbor] = new_distance
+                predecessors[side][neighbor] = current_node
+                heapq.heappush(queues[side], (new_distance, neighbor))
+            # Кандидат на шлях через ребро, що з'єднує обидва фронти
+            if neighbor in other and new_distance + other[neighbor] < best:
+                best, meeting = new_distance + other[neighbor], neighbor
+
+    if meeting is None:
+        return _point_to_point_result(infinity, [], settled)
+
+    path = reconstruct_path(predecessors[0], source, meeting)
+    node = predecessors[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = predecessors[1][node]
+    return _point_to_point_result(best, path, settled)
+
+
+def make_layer_heuristic(G, pos=INITIAL_POS, weight='weight'):
+    """
+    Евристика для A* за X-координатами шарів (як у INITIAL_POS).
+
+    Множник - найменша "вага на одиницю шару" серед ребер, що ведуть вправо, тому
+    оцінка (x_target - x_node) * множник ніколи не перевищує справжньої відстані
+    (допустима й монотонна для невід'ємних ваг).
+
+    Returns:
+        callable: heuristic(node, target) -> нижня оцінка відстані.
+    """
+    ratios = [data.get(weight, 1) / (pos[v][0] - pos[u][0])
+              for u, v, data in G.edges(data=True) if pos[v][0] > pos[u][0]]
+    factor = min(ratios, default=0)
+
+    def heuristic(node, target):
+        return max(0, (pos[target][0] - pos[node][0]) * factor)
+
+    return heuristic
+
+
+def astar(G, source, target, heuristic=None, weight='weight'):
+    """
+    A* з довільною евристикою heuristic(node, target). Без евристики збігається
+    з dijkstra_point_to_point. Для коректності евристика має бути монотонною
+    (наприклад, make_layer_heuristic).
+
+    Returns:
+        dict: Той самий формат, що й у dijkstra_point_to_point.
+    """
+    if heuristic is None:
+        heuristic = lambda node, target: 0
+    infinity = float('inf')
+    distances = {source: 0}
+    predecessors = {source: None}
+    priority_queue = [(heuristic(source, target), 0, source)]
+    visited = set()
+
+    while priority_queue:
+        _, current_distance, current_node = heapq.heappop(priority_queue)
+        if current_node in visited:
+            continue
+        visited.add(current_node)
+        if current_node == target:
+            return _point_to_point_result(current_distance, reconstruct_path(predecessors, source, target),
+                                          len(visited))
+
+        for neighbor, data in G[current_node].items():
+            new_distance = current_distance + data.get(weight, 1)
+            if new_distance < distances.get(neighbor, infinity):
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_node
+                heapq.heappush(priority_queue, (new_distance + heuristic(neighbor, target), new_distance, neighbor))
+
+    return _point_to_point_result(infinity, [], len(visited))
+
+
+def _full_dijkstra_query(G, source, target):
+    """Повна Дейкстра (фіксує всі досяжні вершини) у форматі (відстань, шлях, зафіксовано)."""
+    distances, predecessors = dijkstra(G, source)
+    if target not in distances:
+        return float('inf'), [], len(distances)
+    return distances[target], reconstruct_path(predecessors, source, target), len(distances)
+
+
+def compare_point_to_point(G, source, target, heuristic=None):
+    """
+    Порівнює кількість зафіксованих вершин і час для повної Дейкстри та
+    запитів між двома вершинами.
+
+    Returns:
+        dict: {назва методу: результат із доданим часом 'time' (с)}.
+    """
+    methods = {
+        'повна': lambda: _point_to_point_result(*_full_dijkstra_query(G, source, target)),
+        'рання зупинка': lambda: dijkstra_point_to_point(G, source, target),
+        'двобічна': lambda: bidirectional_dijkstra(G, source, target),
+        'A*': lambda: astar(G, source, target, heuristic),
+    }
+    results = {}
+    print(f"{'Метод':<14} | {'відстань':>8} | {'зафіксовано':>11} | {'час, с':>7}")
+    for name, run in methods.items():
+        start = time.perf_counter()
+        result = run()
+        result['time'] = time.perf_counter() - start
+        results[name] = result
+        print(f"{name:<14} | {result['distance']:>8} | {result['settled']:>11} | {result['time']:7.4f}")
+    return results
+
+
+# --- 3.8. Завантаження великих графів: списки ребер CSV/TSV та бінарний формат ---
+# Заголовок бінарного формату: сигнатура, версія, typecode ваг, тип міток, кількості вершин і ребер.
+# Розмір заголовка кратний 8, тож усі масиви після нього вирівняні для memoryview.cast('q'/'d').
+BINARY_GRAPH_MAGIC = b'CSRGRAPH'
+BINARY_GRAPH_HEADER = struct.Struct('<8sBcc5xqq')
+BINARY_GRAPH_VERSION = 1
+BINARY_GRAPH_EXTENSION = '.csr'
+EDGE_LIST_EXTENSIONS = {'.csv': ',', '.tsv': '\t', '.txt': None}
+# Типові назви колонок джерела й цілі, за якими розпізнається заголовок без колонки ваги
+EDGE_LIST_HEADER_NAMES = {'source', 'target', 'src', 'dst', 'from', 'to', 'u', 'v',
+                          'node1', 'node2', 'head', 'tail', 'джерело', 'ціль'}
+
+
+def _report_throughput(action, path, num_edges, elapsed):
+    size_mb = os.path.getsize(path) / 2**20
+    elapsed = max(elapsed, 1e-9)
+    print(f"{action} {path}: {num_edges} ребер, {size_mb:.1f} МБ за {elapsed:.3f} с "
+          f"({num_edges / elapsed:,.0f} ребер/с, {size_mb / elapsed:.1f} МБ/с)")
+
+
+def load_edge_list(path, delimiter=None, header=None, default_weight=1, report=True):
+    """
+    Потоково читає список ребер "джерело, ціль[, вага]" і за один прохід будує CSRGraph.
+    Мітки вершин інтернуються в цілі ідентифікатори в порядку першої появи,
+    тож у пам'яті лишаються лише масиви ребер і по одному рядку на вершину.
+    Повторні ребра не зливаються (Дейкстра на CSR просто бере найлегше з них).
+
+    Args:
+        path (str): Файл CSV/TSV.
+        delimiter (str, optional): Роздільник; без нього - за розширенням
+            (.csv - кома, .tsv - табуляція) або за першим рядком.
+        header (bool, optional): Чи є рядок заголовка; None - визначити за першим
+            рядком даних (після коментарів і порожніх рядків): це заголовок, якщо
+            його третя колонка не є числом або перші дві колонки мають типові
+            назви з EDGE_LIST_HEADER_NAMES.
+        default_weight: Вага для рядків без третьої колонки.
+        report (bool): Вивести швидкість завантаження.
+
+    Returns:
+        CSRGraph: Завантажений граф.
+
+    Raises:
+        ValueError: Рядок з менш ніж двома колонками.
+    """
+    start = time.perf_counter()
+    index = {}
+    nodes = []
+    sources = array('q')
+    targets = array('q')
+    weights = array('q') if type(default_weight) is int else array('d')
+
+    def intern_node(name):
+        node_id = index.get(name)
+        if node_id is None:
+            node_id = index[name] = len(nodes)
+            nodes.append(sys.intern(name))
+        return node_id
+
+    with open(path, newline='', encoding='utf-8') as file:
+        if delimiter is None:
+            extension = os.path.splitext(path)[1].lower()
+            delimiter = EDGE_LIST_EXTENSIONS.get(extension)
+            if delimiter is None:
+                first_line = file.readline()
+                delimiter = '\t' if '\t' in first_line else ','
+                file.seek(0)
+
+        header_pending = header is not False
+        for line_number, row in enumerate(csv.reader(file, delimiter=delimiter), start=1):
+            if not row or not any(row) or row[0].startswith('#'):
+                continue
+            if len(row) < 2:
+                raise ValueError(f"{path}:{line_number}: очікується 'джерело{delimiter}ціль[{delimiter}вага]'")
+            if header_pending:
+                header_pending = False
+                if header or _is_edge_list_header(row):
+                    continue
+
+            if len(row) > 2 and row[2]:
+                value = row[2]
+                if weights.typecode == 'q':
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        # Перша дробова вага - переходимо на масив дійсних чисел
+                        weights = array('d', weights)
+                        value = float(value)
+                else:
+                    value = float(value)
+            else:
+                value = default_weight
+            sources.append(intern_node(row[0].strip()))
+            targets.append(intern_node(row[1].strip()))
+            weights.append(value)
+
+    csr = CSRGraph.from_edges(nodes, sources, targets, weights)
+    if report:
+        _report_throughput("Завантажено", path, len(targets), time.perf_counter() - start)
+    return csr
+
+
+def _is_edge_list_header(row):
+    if len(row) > 2 and row[2].strip() and not _is_number(row[2]):
+        return True
+    return all(cell.strip().lower() in EDGE_LIST_HEADER_NAMES for cell in row[:2])
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def save_graph_binary(csr, path):
+    """
+    Зберігає CSRGraph у компактний бінарний формат: заголовок, масиви offsets,
+    targets, weights (8 байтів на значення) і мітки вершин (цілі - масивом,
+    рядки - UTF-8 через '\\n').
+    """
+    int_labels = all(type(node) is int for node in csr.nodes)
+    with open(path, 'wb') as file:
+        # У array тип зберігається в typecode, у memoryview з load_graph_binary - у format
+        weight_code = getattr(csr.weights, 'typecode', None) or csr.weights.format
+        file.write(BINARY_GRAPH_HEADER.pack(BINARY_GRAPH_MAGIC, BINARY_GRAPH_VERSION, weight_code.encode(),
+                                            b'i' if int_labels else b's', len(csr), csr.number_of_edges()))
+        for values in (csr.offsets, csr.targets, csr.weights):
+            file.write(memoryview(values).cast('B'))
+        if int_labels:
+            file.write(array('q', csr.nodes))
+        else:
+            file.write('\n'.join(map(str, csr.nodes)).encode('utf-8'))
+
+
+def load_graph_binary(path, memory_map=True, report=True):
+    """
+    Завантажує CSRGraph з бінарного формату save_graph_binary.
+
+    Args:
+        path (str): Шлях до файлу.
+        memory_map (bool): Відобразити файл у пам'ять (mmap) - масиви ребер
+            не копіюються й не розбираються, а підтягуються з диска за потреби.
+            Інакше файл повністю читається в array.
+        report (bool): Вивести швидкість завантаження.
+
+    Returns:
+        CSRGraph: Граф (з memoryview замість array при memory_map=True).
+
+    Raises:
+        ValueError: Файл не є графом у цьому форматі.
+    """
+    start = time.perf_counter()
+    with open(path, 'rb') as file:
+        if memory_map:
+            buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(file.read())
+
+    if len(buffer) < BINARY_GRAPH_HEADER.size:
+        raise ValueError(f"{path}: файл занадто короткий для графа")
+    magic, version, weight_code, label_kind, num_nodes, num_edges = BINARY_GRAPH_HEADER.unpack_from(buffer)
+    if magic != BINARY_GRAPH_MAGIC or version != BINARY_GRAPH_VERSION:
+        raise ValueError(f"{path}: невідомий формат графа")
+    weight_code = weight_code.decode()
+
+    position = BINARY_GRAPH_HEADER.size
+    sections = []
+    for length, typecode in ((num_nodes + 1, 'q'), (num_edges, 'q'), (num_edges, weight_code)):
+        section = buffer[position:position + 8 * length].cast(typecode)
+        if not memory_map:
+            section = array(typecode, section)
+        sections.append(section)
+        position += 8 * length
+
+    if label_kind == b'i':
+        nodes = buffer[position:position + 8 * num_nodes].cast('q').tolist()
+    else:
+        nodes = str(buffer[position:], 'utf-8').split('\n') if num_nodes else []
+
+    csr = CSRGraph(nodes, *sections)
+    if report:
+        _report_throughput("Завантажено", path, num_edges, time.perf_counter() - start)
+    return csr
+
+
+def load_graph(path, **kwargs):
+    """
+    Завантажує граф за розширенням: BINARY_GRAPH_EXTENSION - бінарний формат, інакше список ребер.
+    Параметри, яких обраний завантажувач не приймає (memory_map для CSV, delimiter для .csr),
+    ігноруються; невідомі обом завантажувачам - помилка.
+    """
+    accepted = {loader: set(inspect.signature(loader).parameters) for loader in (load_graph_binary, load_edge_list)}
+    unknown = set(kwargs).difference(*accepted.values())
+    if unknown:
+        raise TypeError(f"load_graph: невідомі параметри {sorted(unknown)}")
+    is_binary = os.path.splitext(path)[1].lower() == BINARY_GRAPH_EXTENSION
+    loader = load_graph_binary if is_binary else load_edge_list
+    return loader(path, **{key: value for key, value in kwargs.items() if key in accepted[loader]})
+
+
 # --- 4. Основна Логіка (Виклик) ---
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Покрокова анімація алгоритму Дейкстри на графі залежностей проєкту")
+    parser.add_argument('--export', metavar='ФАЙЛ',
+                        help="Зберегти анімацію у .gif або .mp4 замість показу у вікні")
+    parser.add_argument('--fps', type=int, default=ANIMATION_FPS, help="Кадрів за секунду у збереженому файлі")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Кількість процесів для рендерингу кадрів (за замовчуванням - усі ядра)")
+    args = parser.parse_args()
+
     # Створюємо граф
     ProjectGraph = create_task_graph()
 
@@ -289,118 +2276,43 @@ if __name__ == "__main__":
     # Визначаємо кінцеву вершину 
     END_TASK = "L"
 
-    # Вмикаємо інтерактивний режим візуалізації 
-    plt.ion()
-    # Створюємо фігуру один раз перед циклом
-    fig = plt.figure(figsize=(20, 12)) 
-
-    step_num = 0
     final_state = None # Зберігаємо фінальний стан
 
-    # Запуск генератора власного алгоритму Дейкстри
-    dijkstra_steps = dijkstra_step_by_step_generator(ProjectGraph, START_TASK)
-
-    for state in dijkstra_steps:
-        step_num += 1
-        final_state = state # Зберігаємо кожен стан, щоб мати фінальний після циклу
-
-        # 1. Визначення кольорів вершин на основі стану
-        node_colors = []
-        node_labels_extra = {} # Мітки для відстаней (distance)
-
-        for node in ProjectGraph.nodes():
-            distance = state['distances'][node]
-            # Форматуємо мітку відстані (ціле число або 'inf')
-            node_labels_extra[node] = f"{distance:.0f}" if distance != float('inf') else 'inf'
-
-            if node in state['visited'] and node != state['current_node']:
-                # Закриті/Фіналізовані вершини (Світло-сірі)
-                node_colors.append('#BBBBBB') # LightGray
-            elif node == state['current_node']:
-                # Активно оброблювана вершина (Червоний/Помаранчевий)
-                node_colors.append('#FFA07A') # LightSalmon
-            elif distance != float('inf'):
-                # Відвідані, але ще не фіналізовані (в черзі) (Жовтий)
-                node_colors.append('#FFFFE0') # LightYellow
-            else:
-                # Не відвідані (Синій)
-                node_colors.append('#ADD8E6') # LightBlue
-
-        # 2. Визначення кольорів ребер на основі стану (підсвічуємо релаксовані)
-        edge_colors_map = {edge: '#AAAAAA' for edge in ProjectGraph.edges()}
-        edges_to_highlight = state['processed_edges']
-
-        for edge in edges_to_highlight:
-            # Ребра, які були оновлені/релаксовані на поточному кроці
-            edge_colors_map[edge] = 'red'
-
-        # Створюємо список кольорів у порядку ребер графа
-        edge_colors = [edge_colors_map[edge] for edge in ProjectGraph.edges()]
-
-        # 3. Візуалізація
-        if state['current_node']:
-            current_node_short = state['current_node']
-            current_distance_val = state['distances'][state['current_node']]
-            current_title = f"Крок {step_num}: Обробка вузла {current_node_short} (відстань: {current_distance_val})"
-        elif step_num == 1:
-            current_title = "Крок 1: Ініціалізація (A=0, решта=inf)"
-        else:
-            # На цьому кроці алгоритм завершено, але візуалізація фінального шляху буде нижче
-            current_title = f"Крок {step_num}: Алгоритм завершено. Фінальні відстані знайдено."
-
-        visualize_graph(ProjectGraph, 
-                        pos=INITIAL_POS, # Використовуємо хардкодовані позиції
-                        start_node=START_TASK, 
-                        title=current_title,
-                        node_colors=node_colors,
-                        edge_colors=edge_colors,
-                        node_labels_extra=node_labels_extra)
-
-    # --- 5. ФІНАЛЬНА ВІЗУАЛІЗАЦІЯ НАЙКОРОТШОГО МАРШРУТУ ---
-    if final_state and END_TASK in final_state['predecessors']:
-
-        # Відновлюємо найкоротший шлях
-        shortest_path = reconstruct_path(final_state['predecessors'], START_TASK, END_TASK)
-
-        # Визначаємо ребра, які належать цьому шляху
-        path_edges = []
-        for i in range(len(shortest_path) - 1):
-            path_edges.append((shortest_path[i], shortest_path[i+1]))
-
-        # Готуємо текстовий вивід шляху
-        path_text = " -> ".join(shortest_path)
-        final_distance = final_state['distances'][END_TASK]
-
-        final_title = (f"ФІНАЛ: Найкоротший шлях до {END_TASK} ({TASK_MAP[END_TASK]}) знайдено! "
-                       f"Час: {final_distance:.0f}")
-
-        # Перемальовуємо кольори для фінального кадру
-        final_node_colors = []
-        final_edge_colors_map = {edge: '#AAAAAA' for edge in ProjectGraph.edges()}
-
-        # Підсвічуємо вершини шляху (LightGreen)
-        for node in ProjectGraph.nodes():
-            if node in shortest_path:
-                final_node_colors.append('#90EE90') # LightGreen
-            else:
-                final_node_colors.append('#BBBBBB') # LightGray (Закриті)
-
-        # Підсвічуємо ребра шляху (DarkGreen)
-        for edge in path_edges:
-            final_edge_colors_map[edge] = '#226622'
-
-        final_edge_colors = [final_edge_colors_map[edge] for edge in ProjectGraph.edges()]
-
-        # Фінальна візуалізація з підсвічуванням шляху та текстовою інформацією
-        visualize_graph(ProjectGraph, 
-                        pos=INITIAL_POS, 
-                        start_node=START_TASK, 
-                        title=final_title,
-                        node_colors=final_node_colors,
-                        edge_colors=final_edge_colors,
-                        node_labels_extra=node_labels_extra, # Зберігаємо фінальні відстані
-                        path_text=path_text)
-
-    # В кінці вимикаємо інтерактивний режим і залишаємо фінальне вікно
-    plt.ioff()
-    plt.show()
\ No newline at end of file
+    def step_frames():
+        """Описи кадрів для кожного кроку генератора власного алгоритму Дейкстри."""
+        global final_state
+        for step_num, state in enumerate(dijkstra_step_by_step_generator(ProjectGraph, START_TASK), start=1):
+            final_state = state # Зберігаємо кожен стан, щоб мати фінальний після циклу
+            yield dijkstra_step_frame(ProjectGraph, state, step_num)
+
+    if args.export:
+        # --- Офлайн-режим: кадри рендеряться паралельно і записуються у файл без пауз ---
+        frames = list(step_frames())
+        final_frame = shortest_path_frame(ProjectGraph, final_state, START_TASK, END_TASK)
+        if final_frame is not None:
+            frames.append(final_frame)
+        start = time.perf_counter()
+        count = export_dijkstra_animation(ProjectGraph, frames, args.export, pos=INITIAL_POS,
+                                          fps=args.fps, workers=args.workers)
+        print(f"Збережено {count} кадрів у {args.export} за {time.perf_counter() - start:.2f} с")
+    else:
+        # Вмикаємо інтерактивний режим візуалізації 
+        plt.ion()
+        # Художники створюються один раз, далі на кожному кроці лише оновлюються кольори та мітки
+        animator = DijkstraAnimator(ProjectGraph, INITIAL_POS, start_node=START_TASK)
+        plt.show(block=False)
+
+        for frame in step_frames():
+            animator.show(frame)
+
+        # --- 5. ФІНАЛЬНА ВІЗУАЛІЗАЦІЯ НАЙКОРОТШОГО МАРШРУТУ ---
+        final_frame = shortest_path_frame(ProjectGraph, final_state, START_TASK, END_TASK)
+        if final_frame is not None:
+            animator.show(final_frame, interval=0)
+
+        # Скільки вершин фіксують запити між START_TASK і END_TASK замість повного обходу
+        compare_point_to_point(ProjectGraph, START_TASK, END_TASK, make_layer_heuristic(ProjectGraph))
+
+        # В кінці вимикаємо інтерактивний режим і залишаємо фінальне вікно
+        plt.ioff()
+        plt.show()
@@ -1,46 +1,152 @@
 # Очистка консолі
 print('\033c', end='')
 
-import uuid
+import heapq
+import itertools
+import operator
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from collections import deque
 
+# Цілі ідентифікатори вузлів - дешевше за uuid і так само унікальні в межах процесу
+_node_ids = itertools.count()
+
 class Node:
     def __init__(self, key, color="skyblue"):
         self.left  : Node = None
         self.right : Node = None
         self.val   = key
         self.color = color # Додатковий аргумент для зберігання кольору вузла
-        self.id    = str(uuid.uuid4()) # Унікальний ідентифікатор для кожного вузла
-
-def add_edges(graph: nx.DiGraph, node: Node, pos, x=0, y=0, layer=1):
-    if node is not None:
-        # Використання id та збереження значення вузла
-        graph.add_node(node.id, color=node.color, label=node.val)
-    if node.left:
-        graph.add_edge(node.id, node.left.id)
-        l = x - 1 / 2 ** layer
-        pos[node.left.id] = (l, y - 1)
-        l = add_edges(graph, node.left, pos, x=l, y=y - 1, layer=layer + 1)
-    if node.right:
-        graph.add_edge(node.id, node.right.id)
-        r = x + 1 / 2 ** layer
-        pos[node.right.id] = (r, y - 1)
-        r = add_edges(graph, node.right, pos, x=r, y=y - 1, layer=layer + 1)
-    return graph
+        self.id    = next(_node_ids) # Унікальний ідентифікатор для кожного вузла
+
+# --- Ітеративне розміщення дерева (без рекурсії, вузли за індексами рівнів) ---
+LARGE_TREE_NODES = 10_000  # Від цього розміру - компактний рендеринг (одна ламана + scatter) без міток
+BASE_NODE_SIZE   = 2500    # Розмір вузла для дерев глибиною до FULL_SIZE_DEPTH
+FULL_SIZE_DEPTH  = 2
+MIN_NODE_SIZE    = 1
+LABELS_MAX_DEPTH = 6       # Глибші дерева малюються без підписів - вони б не вмістилися у вузли
+
+def _layout_from_children(left, right):
+    """
+    Розміщує дерево, задане списками індексів дітей у порядку рівнів
+    (корінь - 0, батько завжди має менший індекс за дитину, -1 - дитини немає).
+
+    x - номер вузла при симетричному (in-order) обході, тож вузли ніколи не
+    злипаються, на відміну від зсувів ±1/2**layer; y - мінус глибина.
+
+    Returns:
+        tuple: (x, depth, parent) - списки за індексами вузлів.
+    """
+    n = len(left)
+    depth = [0] * n
+    parent = [-1] * n
+    for i in range(n):
+        for child in (left[i], right[i]):
+            if child >= 0:
+                parent[child] = i
+                depth[child] = depth[i] + 1
+
+    x = [0] * n
+    rank = 0
+    stack = []
+    node = 0 if n else -1
+    while stack or node >= 0:
+        while node >= 0:
+            stack.append(node)
+            node = left[node]
+        node = stack.pop()
+        x[node] = rank
+        rank += 1
+        node = right[node]
+    return x, depth, parent
+
+def _make_layout(x, depth, parent):
+    return {'x': np.asarray(x, dtype=float), 'y': 0.0 - np.asarray(depth, dtype=float),
+            'parent': np.asarray(parent, dtype=np.int64), 'depth': max(depth, default=0)}
+
+def tree_layout(root_node: Node):
+    """
+    Розміщення дерева з Node: вузли нумеруються цілими індексами в порядку рівнів.
+
+    Returns:
+        dict: 'nodes' (вузли за індексами), 'x', 'y', 'parent' (масиви NumPy), 'depth'.
+    """
+    nodes = [root_node] if root_node else []
+    left, right = [], []
+    i = 0
+    while i < len(nodes):
+        node = nodes[i]
+        for child, children in ((node.left, left), (node.right, right)):
+            if child:
+                children.append(len(nodes))
+                nodes.append(child)
+            else:
+                children.append(-1)
+        i += 1
+    layout = _make_layout(*_layout_from_children(left, right))
+    layout['nodes'] = nodes
+    return layout
+
+def heap_layout(n):
+    """Розміщення купи-масиву з n елементів без створення вузлів (діти i - 2i+1 та 2i+2)."""
+    left = [2 * i + 1 if 2 * i + 1 < n else -1 for i in range(n)]
+    right = [2 * i + 2 if 2 * i + 2 < n else -1 for i in range(n)]
+    return _make_layout(*_layout_from_children(left, right))
+
+def node_size_for_depth(depth):
+    """Розмір вузла (у pt²) за глибиною дерева: удвічі менший на кожен додатковий рівень."""
+    return max(MIN_NODE_SIZE, BASE_NODE_SIZE / 2 ** max(0, depth - FULL_SIZE_DEPTH))
+
+def draw_layout(ax: plt.Axes, layout, labels=None, colors="skyblue"):
+    """
+    Малює розміщене дерево. Невеликі дерева - через networkx з підписами,
+    дерева від LARGE_TREE_NODES вузлів - одна ламана для всіх ребер та один
+    scatter для вузлів, що на порядки швидше за окремі художники на кожен вузол.
+    """
+    x, y, parent = layout['x'], layout['y'], layout['parent']
+    node_size = node_size_for_depth(layout['depth'])
+    children = np.nonzero(parent >= 0)[0]
+
+    if len(x) >= LARGE_TREE_NODES:
+        # Усі ребра - одна ламана з розривами NaN: один Path замість Path на кожне
+        # ребро, як у LineCollection (на 10⁵ ребер це секунди різниці)
+        parents = parent[children]
+        edges_x = np.column_stack([x[parents], x[children], np.full(len(children), np.nan)]).ravel()
+        edges_y = np.column_stack([y[parents], y[children], np.full(len(children), np.nan)]).ravel()
+        ax.plot(edges_x, edges_y, color='#888888', linewidth=0.3, zorder=1)
+        if not isinstance(colors, str):
+            # Кольорів лише кілька - перетворюємо кожен один раз, а не для кожного вузла
+            palette = {color: to_rgba(color) for color in set(colors)}
+            colors = [palette[color] for color in colors]
+        ax.scatter(x, y, s=node_size, c=colors, linewidths=0, zorder=2)
+        ax.set_axis_off()
+        return
 
-def draw_tree(tree_root):
     tree = nx.DiGraph()
-    pos = {tree_root.id: (0, 0)}
-    tree = add_edges(tree, tree_root, pos)
+    tree.add_nodes_from(range(len(x)))
+    tree.add_edges_from(zip(parent[children].tolist(), children.tolist()))
+    pos = dict(enumerate(zip(x.tolist(), y.tolist())))
+    show_labels = labels is not None and layout['depth'] <= LABELS_MAX_DEPTH
+    font_size = max(6, 12 - 2 * max(0, layout['depth'] - FULL_SIZE_DEPTH))
+    nx.draw(tree, pos=pos, ax=ax, labels=labels if show_labels else None, with_labels=show_labels,
+            font_size=font_size, arrows=False, node_size=node_size, node_color=colors)
 
-    colors = [node[1]['color'] for node in tree.nodes(data=True)]
+def draw_tree(tree_root):
+    layout = tree_layout(tree_root)
+    colors = [node.color for node in layout['nodes']]
+    if len(set(colors)) == 1:
+        colors = colors[0]  # Один колір на все дерево - без перетворення кольору кожного вузла
     # Використовуйте значення вузла для міток
-    labels = {node[0]: node[1]['label'] for node in tree.nodes(data=True)}
+    labels = {i: node.val for i, node in enumerate(layout['nodes'])}
 
     plt.figure(figsize=(8, 5))
-    nx.draw(tree, pos=pos, labels=labels, arrows=False, node_size=2500, node_color=colors)
+    draw_layout(plt.gca(), layout, labels, colors)
     plt.show()
 
 # Створення дерева
@@ -51,8 +157,9 @@ root.left.right = Node(10)
 root.right = Node(1)
 root.right.left = Node(3)
 
-# Відображення дерева
-draw_tree(root)
+# Відображення дерева (лише при запуску скрипта - не в процесах пулу, що імпортують модуль)
+if __name__ == "__main__":
+    draw_tree(root)
 
 
 # ========================================================== #
@@ -86,19 +193,184 @@ def bool_decor(value: bool | None) -> str:
 
 # --- Існуючі функції для побудови купи з масиву (якщо аналіз провалився) ---
 def sift_down_max(arr, n, i):
-    largest = i
-    left = 2 * i + 1
-    right = 2 * i + 2
-    if left < n and arr[left] > arr[largest]: largest = left
-    if right < n and arr[right] > arr[largest]: largest = right
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]
-        sift_down_max(arr, n, largest)
+    sift_down(arr, i, n, mode='max')
 
 def build_max_heap(arr):
+    heapify(arr, mode='max')
+
+# --- Ітеративні просіювання та побудова купи (d-арні, списки та NumPy) ---
+HEAP_ARITIES = (2, 4, 8)  # 4- та 8-арні купи нижчі, тож просіювання торкається менше рівнів пам'яті
+
+HEAP_MODES = {'min': operator.lt, 'max': operator.gt}
+
+def _check_heap_args(mode, arity):
+    if mode not in HEAP_MODES:
+        raise ValueError(f"Невідомий режим купи '{mode}', очікується 'min' або 'max'")
+    if arity < 2:
+        raise ValueError(f"Арність купи має бути не менше 2, отримано {arity}")
+    return HEAP_MODES[mode]
+
+def _sift_down(arr, keys, pos, n, before, arity=2):
+    """
+    Спільне просіювання вниз для d-арної купи arr[:n] (діти вузла pos -
+    d*pos+1 .. d*pos+d), яким користуються і вільні функції, і BinaryHeap.
+    Порівнюються keys (паралельний список ключів або сам arr). Дорожчих за
+    пам'ять обмінів немає: кращий нащадок зсувається вгору в "дірку", а сам
+    елемент записується один раз.
+    """
+    separate = keys is not arr
+    item, key = arr[pos], keys[pos]
+    child = arity * pos + 1
+    while child < n:
+        best = child
+        if arity == 2:
+            # Для бінарної купи - без range(): помітно швидше в гарячому циклі
+            if child + 1 < n and before(keys[child + 1], keys[child]):
+                best = child + 1
+        else:
+            for other in range(child + 1, min(child + arity, n)):
+                if before(keys[other], keys[best]):
+                    best = other
+        if not before(keys[best], key):
+            break
+        arr[pos] = arr[best]
+        if separate:
+            keys[pos] = keys[best]
+        pos = best
+        child = arity * pos + 1
+    arr[pos] = item
+    if separate:
+        keys[pos] = key
+
+def _sift_up(arr, keys, pos, before, arity=2):
+    """Спільне просіювання вгору для d-арної купи (метод "дірки", ключі - як у _sift_down)."""
+    separate = keys is not arr
+    item, key = arr[pos], keys[pos]
+    while pos > 0:
+        parent = (pos - 1) // arity
+        if not before(key, keys[parent]):
+            break
+        arr[pos] = arr[parent]
+        if separate:
+            keys[pos] = keys[parent]
+        pos = parent
+    arr[pos] = item
+    if separate:
+        keys[pos] = key
+
+def sift_down(arr, i, n=None, mode='min', arity=2):
+    """
+    Ітеративно опускає arr[i] у d-арній купі arr[:n] (див. _sift_down).
+    Працює зі списками та масивами NumPy.
+    """
+    before = _check_heap_args(mode, arity)
+    _sift_down(arr, arr, i, len(arr) if n is None else n, before, arity)
+
+def sift_up(arr, i, mode='min', arity=2):
+    """Ітеративно піднімає arr[i] у d-арній купі (метод "дірки")."""
+    before = _check_heap_args(mode, arity)
+    _sift_up(arr, arr, i, before, arity)
+
+def heapify(arr, mode='min', arity=2):
+    """
+    Перетворює arr на d-арну купу на місці методом Флойда (знизу вгору) за O(n).
+
+    Для числових масивів NumPy використовується векторизований варіант: вузли
+    одного рівня мають неперетинні піддерева, тож увесь рівень просіюється
+    одночасно. Списки (і масиви NumPy з dtype=object) обробляються поелементно.
+    """
+    before = _check_heap_args(mode, arity)
+    if isinstance(arr, np.ndarray) and arr.dtype != object:
+        _heapify_numpy(arr, mode, arity)
+        return
     n = len(arr)
-    for i in range(n // 2 - 1, -1, -1):
-        sift_down_max(arr, n, i)
+    for pos in range((n - 2) // arity, -1, -1):
+        _sift_down(arr, arr, pos, n, before, arity)
+
+def _heapify_numpy(arr, mode, arity):
+    n = len(arr)
+    if n < 2:
+        return
+    pick = np.argmin if mode == 'min' else np.argmax
+    better = np.less if mode == 'min' else np.greater
+    offsets = np.arange(arity)
+
+    # Межі рівнів: рівень k займає індекси [start_k, start_{k+1}), start_{k+1} = d*start_k + 1
+    starts = [0]
+    while starts[-1] < n:
+        starts.append(starts[-1] * arity + 1)
+    last_parent = (n - 2) // arity
+
+    for level in range(len(starts) - 2, -1, -1):
+        if starts[level] > last_parent:
+            continue
+        active = np.arange(starts[level], min(starts[level + 1], last_parent + 1))
+        while active.size:
+            first_child = arity * active + 1
+            keep = first_child < n
+            active, first_child = active[keep], first_child[keep]
+            children = first_child[:, None] + offsets
+            # Відсутніх нащадків (за межею масиву) підміняємо першим - він завжди існує
+            children = np.where(children < n, children, first_child[:, None])
+            best = children[np.arange(children.shape[0]), pick(arr[children], axis=1)]
+            keep = better(arr[best], arr[active])
+            active, best = active[keep], best[keep]
+            arr[active], arr[best] = arr[best], arr[active]
+            active = best
+
+def heap_push(arr, item, mode='min', arity=2):
+    """Додає item до d-арної купи-списку."""
+    arr.append(item)
+    sift_up(arr, len(arr) - 1, mode, arity)
+
+def heap_pop(arr, mode='min', arity=2):
+    """Видаляє та повертає вершину d-арної купи-списку."""
+    before = _check_heap_args(mode, arity)
+    last = arr.pop()
+    if not arr:
+        return last
+    top = arr[0]
+    arr[0] = last
+    _sift_down(arr, arr, 0, len(arr), before, arity)
+    return top
+
+def benchmark_heapify(sizes=(10**5, 10**6, 10**7), arities=HEAP_ARITIES, max_python_size=10**6, seed=0):
+    """
+    Порівнює час побудови min-купи: heapq.heapify (C), heapify для списку
+    (чистий Python, лише до max_python_size елементів) та векторизований
+    heapify для масиву NumPy - для кожної арності.
+
+    Returns:
+        list[dict]: Час (с) кожної реалізації для кожного розміру.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    print(f"{'Елементів':>10} | {'арність':>7} | {'heapq':>7} | {'список':>9} | {'NumPy':>7}")
+    for size in sizes:
+        values = rng.random(size)
+        data = values.tolist()
+        start = time.perf_counter()
+        heapq.heapify(data)
+        heapq_time = time.perf_counter() - start
+
+        for arity in arities:
+            row = {'size': size, 'arity': arity, 'heapq': heapq_time, 'list': None}
+            if size <= max_python_size:
+                data = values.tolist()
+                start = time.perf_counter()
+                heapify(data, 'min', arity)
+                row['list'] = time.perf_counter() - start
+
+            array = values.copy()
+            start = time.perf_counter()
+            heapify(array, 'min', arity)
+            row['numpy'] = time.perf_counter() - start
+
+            assert validate_heap_array(array, arity) is True, "heapify дав некоректну купу"
+            results.append(row)
+            list_time = f"{row['list']:9.3f}" if row['list'] is not None else f"{'пропущено':>9}"
+            print(f"{size:>10} | {arity:>7} | {heapq_time:7.3f} | {list_time} | {row['numpy']:7.3f}")
+    return results
 
 def list_to_tree(arr, index=0):
     if index < len(arr):
@@ -119,6 +391,302 @@ def tree_to_list_bfs(root_node: Node):
         if node.right: queue.append(node.right)
     return values
 
+# --- Купа на масиві (неявне розміщення: діти вузла i - 2i+1 та 2i+2) ---
+class BinaryHeap:
+    """
+    Бінарна купа на звичайному списку (без вузлів-об'єктів і uuid).
+
+    Режими: mode='min' або 'max', а також довільна функція key - тоді порядок
+    визначається значеннями key(елемент), обчисленими один раз при вставці
+    (зберігаються в паралельному списку). Дерево з Node будується лише для
+    візуалізації (to_tree / draw).
+    """
+
+    def __init__(self, iterable=(), mode='min', key=None):
+        self._before = _check_heap_args(mode, 2)
+        self.mode = mode
+        self.key = key
+        self.heapify(iterable)
+
+    def heapify(self, iterable=None):
+        """
+        Перебудовує купу за O(n) методом Флойда (просіювання вниз від останнього
+        батька до кореня). Без аргументу - відновлює порядок поточних елементів.
+        """
+        if iterable is not None:
+            self.data = list(iterable)
+            # Без key ключем є сам елемент - той самий список, без копії
+            self.keys = [self.key(item) for item in self.data] if self.key else self.data
+        data, keys, before = self.data, self.keys, self._before
+        for pos in reversed(range(len(keys) // 2)):
+            _sift_down(data, keys, pos, len(keys), before)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        return bool(self.data)
+
+    def __iter__(self):
+        """Елементи в порядку масиву (рівень за рівнем), а не у відсортованому."""
+        return iter(self.data)
+
+    def __repr__(self):
+        return f"BinaryHeap({self.data!r}, mode={self.mode!r})"
+
+    def to_list(self):
+        """Копія масиву купи."""
+        return list(self.data)
+
+    def peek(self):
+        """Повертає вершину купи (мінімум або максимум) без видалення."""
+        if not self.data:
+            raise IndexError("peek from empty heap")
+        return self.data[0]
+
+    def push(self, item):
+        self.data.append(item)
+        if self.keys is not self.data:
+            self.keys.append(self.key(item))
+        _sift_up(self.data, self.keys, len(self.data) - 1, self._before)
+
+    def pop(self):
+        """Видаляє та повертає вершину купи."""
+        data, keys = self.data, self.keys
+        if not data:
+            raise IndexError("pop from empty heap")
+        last = data.pop()
+        last_key = keys.pop() if keys is not data else last
+        if not data:
+            return last
+        top = data[0]
+        data[0] = last
+        keys[0] = last_key
+        _sift_down(data, keys, 0, len(keys), self._before)
+        return top
+
+    def pushpop(self, item):
+        """
+        Додає item і одразу видаляє вершину - швидше за push() + pop().
+        Якщо item сам мав би стати вершиною, купа не змінюється.
+        """
+        data, keys = self.data, self.keys
+        key = self.key(item) if keys is not data else item
+        if data and self._before(keys[0], key):
+            item, data[0] = data[0], item
+            keys[0] = key
+            _sift_down(data, keys, 0, len(keys), self._before)
+        return item
+
+    def replace(self, item):
+        """Видаляє вершину та додає item (розмір не змінюється); повертає стару вершину."""
+        data, keys = self.data, self.keys
+        if not data:
+            raise IndexError("replace on empty heap")
+        top = data[0]
+        data[0] = item
+        if keys is not data:
+            keys[0] = self.key(item)
+        _sift_down(data, keys, 0, len(keys), self._before)
+        return top
+
+    def is_valid(self):
+        """
+        Чи виконується порядок купи в поточному режимі. Ключі можуть бути
+        довільними об'єктами (кортежі тощо), тому перевірка поелементна.
+        """
+        keys, before = self.keys, self._before
+        return not any(before(keys[i], keys[(i - 1) >> 1]) for i in range(1, len(keys)))
+
+    @classmethod
+    def from_tree(cls, root_node: Node, mode='min', key=None):
+        """Будує купу зі значень дерева (обхід у ширину)."""
+        return cls(tree_to_list_bfs(root_node), mode=mode, key=key)
+
+    def to_tree(self):
+        """Будує дерево з Node за неявними індексами 2i+1 / 2i+2 - лише для візуалізації."""
+        nodes = [Node(value) for value in self.data]
+        for i, node in enumerate(nodes):
+            left = 2 * i + 1
+            if left < len(nodes):
+                node.left = nodes[left]
+            if left + 1 < len(nodes):
+                node.right = nodes[left + 1]
+        return nodes[0] if nodes else None
+
+    def draw(self):
+        """Малює купу як дерево прямо з масиву - без створення вузлів Node."""
+        if self.data:
+            plt.figure(figsize=(8, 5))
+            draw_layout(plt.gca(), heap_layout(len(self.data)), dict(enumerate(self.data)))
+            plt.show()
+
+# --- Перевірка купи за один прохід (дерево) та векторизовано (масив) ---
+VALIDATION_CHUNK = 1 << 20  # Скільки ребер батько-нащадок перевіряти за один векторний крок
+
+def validate_heap_tree(root_node: Node):
+    """
+    За один ітеративний обхід у ширину визначає, чи дерево повне, і чи
+    виконується порядок Min-Heap / Max-Heap. Рекурсії немає, тож глибина
+    дерева не обмежена; обхід зупиняється, щойно спростовано все одразу.
+
+    Returns:
+        tuple: (is_complete, heap_type), де heap_type - True (Min-Heap),
+               False (Max-Heap) або None (ні те, ні інше).
+    """
+    if not root_node:
+        return True, True  # Порожнє дерево вважається купою
+
+    is_complete = is_min = is_max = True
+    found_gap = False
+    queue = deque([root_node])
+    while queue:
+        node = queue.popleft()
+        for child in (node.left, node.right):
+            if child is None:
+                found_gap = True
+                continue
+            if found_gap:
+                is_complete = False
+            if node.val > child.val: is_min = False
+            if node.val < child.val: is_max = False
+            queue.append(child)
+        if not (is_complete or is_min or is_max):
+            break
+
+    if is_min: return is_complete, True
+    if is_max: return is_complete, False
+    return is_complete, None
+
+def validate_heap_array(arr, arity=2):
+    """
+    Перевіряє порядок купи в масиві (неявне розміщення, тож структура завжди повна)
+    векторизовано за O(n): кожен елемент порівнюється з батьком (i - 1) // arity.
+    Масив обробляється блоками, і перевірка припиняється, щойно спростовано
+    і Min-, і Max-порядок.
+
+    Returns:
+        True (Min-Heap), False (Max-Heap) або None (ні те, ні інше).
+    """
+    values = np.asarray(arr)
+    n = len(values)
+    is_min = is_max = True
+    for start in range(1, n, VALIDATION_CHUNK):
+        children = values[start:start + VALIDATION_CHUNK]
+        parents = values[(np.arange(start, start + len(children)) - 1) // arity]
+        if is_min and (parents > children).any(): is_min = False
+        if is_max and (parents < children).any(): is_max = False
+        if not (is_min or is_max):
+            return None
+    if is_min: return True
+    if is_max: return False
+    return None
+
+# --- Top-k, heapsort та злиття відсортованих потоків на основі куп ---
+TOP_K_CHUNK_SIZE = 100_000  # Розмір блоку записів, що передається одному процесу
+
+def _bounded_select(iterable, k, key=None, largest=True):
+    """
+    Один прохід по iterable з купою розміру не більше k: для top-k це Min-Heap,
+    вершина якої - найменший з k кращих і першим витісняється. O(n log k) часу,
+    O(k) пам'яті. Повертає список, відсортований від кращого до гіршого.
+    """
+    if k <= 0:
+        return []
+    heap = BinaryHeap(mode='min' if largest else 'max', key=key)
+    for item in iterable:
+        if len(heap) < k:
+            heap.push(item)
+        else:
+            heap.pushpop(item)  # Якщо item гірший за вершину, купа не змінюється
+    result = [heap.pop() for _ in range(len(heap))]
+    result.reverse()
+    return result
+
+def top_k(iterable, k, key=None):
+    """k найбільших елементів (за key) потоку будь-якої довжини, від більшого до меншого."""
+    return _bounded_select(iterable, k, key, largest=True)
+
+def bottom_k(iterable, k, key=None):
+    """k найменших елементів (за key) потоку будь-якої довжини, від меншого до більшого."""
+    return _bounded_select(iterable, k, key, largest=False)
+
+def _top_k_chunk(chunk, k, key, largest):
+    """Часткова купа (у вигляді відсортованого списку) для одного блоку в процесі пулу."""
+    return _bounded_select(chunk, k, key, largest)
+
+def parallel_top_k(iterable, k, key=None, largest=True, chunk_size=TOP_K_CHUNK_SIZE, workers=None):
+    """
+    Top-k (або bottom-k при largest=False) з розбиттям потоку на блоки, які
+    обробляються в процесах пулу. Часткові купи зливаються в підсумкову купу
+    розміру k. У пам'яті одночасно лише кілька блоків (по 2 на процес), тож
+    потік може бути значно більшим за оперативну пам'ять.
+
+    key має бути функцією рівня модуля (її передають у процеси через pickle).
+    """
+    if k <= 0:
+        return []
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(iterable)
+    result = []
+
+    def merge_partial(done):
+        nonlocal result
+        for future in done:
+            result = _bounded_select(result + future.result(), k, key, largest)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while chunk := list(islice(iterator, chunk_size)):
+            pending.add(executor.submit(_top_k_chunk, chunk, k, key, largest))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                merge_partial(done)
+        merge_partial(pending)
+    return result
+
+def heapsort(arr, reverse=False, arity=2):
+    """
+    Сортування купою на місці (список або масив NumPy), O(n log n) і O(1) додаткової пам'яті:
+    Max-Heap для зростання (вершина переноситься в кінець), Min-Heap - для спадання.
+    """
+    mode = 'min' if reverse else 'max'
+    before = _check_heap_args(mode, arity)
+    heapify(arr, mode, arity)
+    for end in range(len(arr) - 1, 0, -1):
+        arr[0], arr[end] = arr[end], arr[0]
+        _sift_down(arr, arr, 0, end, before, arity)
+
+def merge_sorted_streams(*streams, key=None, reverse=False):
+    """
+    Лінивий k-way merge відсортованих потоків (як heapq.merge) на BinaryHeap:
+    у купі по одному поточному елементу з кожного потоку, O(log k) на елемент.
+    За рівних ключів першим іде елемент з потоку з меншим номером.
+    """
+    if key is None:
+        key = lambda item: item
+    # Запис купи: [ключ, номер потоку, елемент, ітератор]; номер робить порядок стабільним
+    if reverse:
+        heap = BinaryHeap(mode='max', key=lambda entry: (entry[0], -entry[1]))
+    else:
+        heap = BinaryHeap(mode='min', key=lambda entry: (entry[0], entry[1]))
+    entries = []
+    for number, stream in enumerate(streams):
+        iterator = iter(stream)
+        for item in iterator:
+            entries.append([key(item), number, item, iterator])
+            break
+    heap.heapify(entries)
+
+    while heap:
+        entry = heap.peek()
+        yield entry[2]
+        for item in entry[3]:
+            heap.replace([key(item), entry[1], item, entry[3]])
+            break
+        else:
+            heap.pop()
+
 # --- Головна функція, що реалізує вашу логіку ---
 
 def analyze_and_draw_heap(root_node: Node):
@@ -128,70 +696,19 @@ def analyze_and_draw_heap(root_node: Node):
     """
     
     # --- Внутрішні допоміжні функції ---
-    def _is_complete_tree(root: Node):
-        if not root:
-            return True
-        queue = deque([root])
-        found_first_gap = False
-        while queue:
-            node = queue.popleft()
-            if node:
-                if found_first_gap:
-                    return False
-                queue.append(node.left)
-                queue.append(node.right)
-            else:
-                found_first_gap = True
-        return True
-
-    def _check_heap_properties(root: Node):
-        """
-        Перевіряє властивості Min-Heap та Max-Heap за один прохід.
-        Повертає:
-        - True: якщо це Min-Heap.
-        - False: якщо це Max-Heap.
-        - None: якщо ні те, ні інше.
-        """
-        if not root:
-            return True # Порожнє дерево вважається купою
-
-        is_min = True
-        is_max = True
-
-        def _traverse(node: Node):
-            nonlocal is_min, is_max
-            if not node:
-                return
-
-            if node.left:
-                if node.val > node.left.val: is_min = False
-                if node.val < node.left.val: is_max = False
-                _traverse(node.left)
-            
-            if node.right:
-                if node.val > node.right.val: is_min = False
-                if node.val < node.right.val: is_max = False
-                _traverse(node.right)
-        
-        _traverse(root)
-
-        if is_min: return True
-        if is_max: return False
-        return None
-        
     def _rebuild_as_max_heap(node_to_rebuild: Node):
         print("Перебудовуємо дерево у Max-Heap за замовчуванням.")
         values = tree_to_list_bfs(node_to_rebuild)
         print(f"Отримані значення: {values}")
-        build_max_heap(values)
-        print(f"Значення після перетворення на Max-Heap: {values}")
-        return list_to_tree(values)
+        heap = BinaryHeap(values, mode='max')
+        print(f"Значення після перетворення на Max-Heap: {heap.to_list()}")
+        # Дерево з вузлів потрібне лише для малювання
+        return heap.to_tree()
 
     # --- Основний блок аналізу та прийняття рішень ---
     print(f"{TITLE1} --- Починаємо глибокий аналіз дерева --- {RESET}\n")
     
-    is_structurally_complete = _is_complete_tree(root_node)
-    heap_type = _check_heap_properties(root_node)
+    is_structurally_complete, heap_type = validate_heap_tree(root_node)
     
     print(f"Дерево має структуру купи : {bool_decor(is_structurally_complete)}  {DIM+ITALIC}(is_complete, тобто повне дерево){RESET}")
     print(f"Тип властивостей для купи : {bool_decor(heap_type)}  "
@@ -216,4 +733,5 @@ def analyze_and_draw_heap(root_node: Node):
     draw_tree(root_node)
 
 # Виклик нової "розумної" функції
-analyze_and_draw_heap(root)
\ No newline at end of file
+if __name__ == "__main__":
+    analyze_and_draw_heap(root)
\ No newline at end of file
@@ -1,10 +1,12 @@
 # Очистка консолі (залишено з вашого прикладу)
 print('\033c', end='')
 
-import uuid
+import itertools
 from collections import deque
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from matplotlib.widgets import Button
 
 # --- КОНСТАНТИ ТА НАЛАШТУВАННЯ ---
@@ -22,6 +24,14 @@ COLORS = [
 ]
 PAUSE_DURATION = 0.4  # Тривалість паузи між кроками в секундах
 
+# Розміщення та розміри вузлів. Ті самі константи, tree_layout і node_size_for_depth є в task_4.py:
+# завдання - окремі скрипти без взаємних імпортів, тож зміни треба вносити в обидва файли
+LARGE_TREE_NODES = 10_000  # Від цього розміру - компактний рендеринг (одна ламана + scatter) без міток
+BASE_NODE_SIZE   = 2500    # Розмір вузла для дерев глибиною до FULL_SIZE_DEPTH
+FULL_SIZE_DEPTH  = 2
+MIN_NODE_SIZE    = 1
+LABELS_MAX_DEPTH = 6       # Глибші дерева малюються без підписів
+
 # Налаштування кнопки "Продовжити"
 BUTTON_POS_X  = 0.65
 BUTTON_POS_Y  = 0.02
@@ -68,51 +78,104 @@ def wait_for_button_click(fig: plt.Figure):
 
 # --- КЛАС ВУЗЛА ТА ФУНКЦІЇ ВІДОБРАЖЕННЯ ДЕРЕВА ---
 
+# Цілі ідентифікатори вузлів замість uuid
+_node_ids = itertools.count()
+
 class Node:
     def __init__(self, key, color=INITIAL_COLOR):
         self.left  : Node = None
         self.right : Node = None
         self.val   = key
         self.color = color
-        self.id    = str(uuid.uuid4())
-
-def add_edges(graph: nx.DiGraph, node: Node, pos, x=0, y=0, layer=1):
-    if node is not None:
-        graph.add_node(node.id, color=node.color, label=node.val)
-        if node.left:
-            graph.add_edge(node.id, node.left.id)
-            l = x - 1 / 2 ** layer
-            pos[node.left.id] = (l, y - 1)
-            add_edges(graph, node.left, pos, x=l, y=y - 1, layer=layer + 1)
-        if node.right:
-            graph.add_edge(node.id, node.right.id)
-            r = x + 1 / 2 ** layer
-            pos[node.right.id] = (r, y - 1)
-            add_edges(graph, node.right, pos, x=r, y=y - 1, layer=layer + 1)
-    return graph
+        self.id    = next(_node_ids)
+
+def tree_layout(root: Node):
+    """
+    Ітеративне розміщення дерева: вузли нумеруються цілими індексами в порядку
+    рівнів, x - номер вузла при симетричному (in-order) обході (вузли не злипаються
+    на будь-якій глибині), y - мінус глибина.
+
+    Returns:
+        dict: 'nodes', 'x', 'y', 'parent' (списки за індексами) та 'depth'.
+    """
+    nodes = [root] if root else []
+    left, right = [], []
+    parent, depth = [-1] * len(nodes), [0] * len(nodes)
+    i = 0
+    while i < len(nodes):
+        node = nodes[i]
+        for child, children in ((node.left, left), (node.right, right)):
+            if child:
+                children.append(len(nodes))
+                nodes.append(child)
+                parent.append(i)
+                depth.append(depth[i] + 1)
+            else:
+                children.append(-1)
+        i += 1
+
+    x = [0] * len(nodes)
+    rank = 0
+    stack = []
+    current = 0 if nodes else -1
+    while stack or current >= 0:
+        while current >= 0:
+            stack.append(current)
+            current = left[current]
+        current = stack.pop()
+        x[current] = rank
+        rank += 1
+        current = right[current]
+
+    return {'nodes': nodes, 'x': x, 'y': [-d for d in depth], 'parent': parent, 'depth': max(depth, default=0)}
+
+def node_size_for_depth(depth):
+    """Розмір вузла (у pt²) за глибиною дерева: удвічі менший на кожен додатковий рівень."""
+    return max(MIN_NODE_SIZE, BASE_NODE_SIZE / 2 ** max(0, depth - FULL_SIZE_DEPTH))
 
 def _draw_tree_on_ax(ax: plt.Axes, tree_root: Node):
     """Допоміжна функція для перемальовування дерева на існуючому полотні."""
     ax.clear()
-    tree = nx.DiGraph()
-    pos = {tree_root.id: (0, 0)}
-    tree = add_edges(tree, tree_root, pos)
-
-    colors = [node[1]['color'] for node in tree.nodes(data=True)]
-    labels = {node[0]: node[1]['label'] for node in tree.nodes(data=True)}
-
-    nx.draw(tree, pos=pos, labels=labels, arrows=False, node_size=2500, node_color=colors, ax=ax)
+    layout = tree_layout(tree_root)
+    nodes, x, y, parent = layout['nodes'], layout['x'], layout['y'], layout['parent']
+    colors = [node.color for node in nodes]
+    node_size = node_size_for_depth(layout['depth'])
+
+    if len(nodes) >= LARGE_TREE_NODES:
+        # Усі ребра - одна ламана з розривами NaN, усі вузли - один scatter
+        x, y, parent = np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(parent[1:])
+        gaps = np.full(len(parent), np.nan)
+        edges_x = np.column_stack([x[parent], x[1:], gaps]).ravel()
+        edges_y = np.column_stack([y[parent], y[1:], gaps]).ravel()
+        ax.plot(edges_x, edges_y, color='#888888', linewidth=0.3, zorder=1)
+        # Кольорів лише кілька - перетворюємо кожен один раз, а не для кожного вузла
+        palette = {color: to_rgba(color) for color in set(colors)}
+        ax.scatter(x, y, s=node_size, c=[palette[color] for color in colors], linewidths=0, zorder=2)
+        ax.set_axis_off()
+    else:
+        tree = nx.DiGraph()
+        tree.add_nodes_from(range(len(nodes)))
+        tree.add_edges_from((parent[i], i) for i in range(1, len(nodes)))
+        pos = {i: (x[i], y[i]) for i in range(len(nodes))}
+        show_labels = layout['depth'] <= LABELS_MAX_DEPTH
+        labels = {i: node.val for i, node in enumerate(nodes)} if show_labels else None
+        font_size = max(6, 12 - 2 * max(0, layout['depth'] - FULL_SIZE_DEPTH))
+        nx.draw(tree, pos=pos, labels=labels, with_labels=show_labels, font_size=font_size,
+                arrows=False, node_size=node_size, node_color=colors, ax=ax)
     plt.draw()
 
 
 # --- ФУНКЦІЇ АЛГОРИТМІВ ОБХОДУ ТА ВІЗУАЛІЗАЦІЇ ---
 
 def reset_node_colors(node: Node):
-    """Рекурсивно скидає колір всіх вузлів до початкового."""
-    if node:
-        node.color = INITIAL_COLOR
-        reset_node_colors(node.left)
-        reset_node_colors(node.right)
+    """Скидає колір всіх вузлів до початкового (ітеративно - без обмеження глибини)."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current:
+            current.color = INITIAL_COLOR
+            stack.append(current.left)
+            stack.append(current.right)
 
 def visualize_dfs(root: Node, ax: plt.Axes):
     """Візуалізує обхід дерева в глибину (DFS)."""